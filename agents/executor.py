@@ -1,12 +1,42 @@
 """Executor Agent - executes planned steps and calls tools"""
+import json
 import logging
-from typing import Any, Dict, List
+import re
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
 
-from tools import GitHubTool, WeatherTool
+from config import Config
+from tools import BaseTool, GitHubTool, WeatherTool, create_session
 from .base import BaseAgent
 
 logger = logging.getLogger(__name__)
 
+# Matches references to earlier step outputs, e.g. "${step_2}" or "${step_2.result.count}"
+STEP_REFERENCE_PATTERN = re.compile(r"\$\{step_(\d+)((?:\.\w+)*)\}")
+
+
+class StepResult(NamedTuple):
+    """
+    Outcome of a single step
+    
+    A tuple rather than a dict keeps per-step records compact while a plan
+    runs; execute() converts them to dicts for callers.
+    """
+    step_number: Any
+    status: str
+    description: Optional[str] = None
+    tool: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
+    result: Any = None
+    error: Optional[str] = None
+    reason: Optional[str] = None
+    speculative: Optional[bool] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a dict, leaving out fields that were not set"""
+        return {key: value for key, value in zip(self._fields, self) if value is not None}
+
 
 class ExecutorAgent(BaseAgent):
     """Agent that executes steps and calls tools"""
@@ -14,94 +44,317 @@ class ExecutorAgent(BaseAgent):
     def __init__(self):
         """Initialize Executor Agent"""
         super().__init__("executor")
-        self.tools = {
-            "github_search_repos": GitHubTool(),
-            "get_weather": WeatherTool(),
+        # Tools are constructed on first use so plans that never call them don't pay for setup
+        # One pooled HTTP session shared by all tools and worker threads
+        self.session = create_session()
+        self.tool_factories: Dict[str, Callable[[], BaseTool]] = {
+            "github_search_repos": partial(GitHubTool, session=self.session),
+            "get_weather": partial(WeatherTool, session=self.session),
         }
+        self._tools: Dict[str, BaseTool] = {}
+        self.pool = ThreadPoolExecutor(max_workers=Config.MAX_PARALLEL_STEPS)
+    
+    def speculate(self, steps: List[Dict[str, Any]]) -> Dict[Tuple[str, str], Future]:
+        """
+        Start tool calls for likely steps before the final plan is known
+        
+        Pass the returned mapping to execute(); steps whose tool and params
+        match reuse the in-flight call, the rest are discarded.
+        
+        Args:
+            steps: Guessed steps, e.g. from the rule-based planner
+            
+        Returns:
+            In-flight tool calls keyed by (tool, params)
+        """
+        speculation = {}
+        
+        for step in steps:
+            tool_name = step.get("tool", "none")
+            params = step.get("params", {})
+            
+            # Steps that need earlier outputs can't start early
+            if tool_name not in self.tool_factories or STEP_REFERENCE_PATTERN.search(str(params)):
+                continue
+            
+            key = self._speculation_key(tool_name, params)
+            if key not in speculation:
+                self.logger.debug("Speculatively calling tool %s with params: %s", tool_name, params)
+                speculation[key] = self.pool.submit(self._call_tool, tool_name, params)
+        
+        return speculation
     
-    def execute(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+    def execute(
+        self,
+        plan: Dict[str, Any],
+        speculation: Optional[Dict[Tuple[str, str], Future]] = None
+    ) -> Dict[str, Any]:
         """
         Execute the plan steps
         
         Args:
             plan: Plan from Planner Agent
+            speculation: In-flight tool calls from speculate(), if any
             
         Returns:
             Execution results with step outcomes
         """
-        self.logger.info(f"Executing plan: {plan.get('objective', 'unknown')}")
+        self.logger.info("Executing plan: %s", plan.get('objective', 'unknown'))
         
-        results = []
-        execution_context = {}
+        steps = plan.get("steps", [])
+        dependencies = self._build_dependencies(steps)
         
-        for step in plan.get("steps", []):
-            step_result = self._execute_step(step, execution_context)
-            results.append(step_result)
+        # Results by plan position; steps read earlier outputs straight from this list
+        results: List[Optional[StepResult]] = [None] * len(steps)
+        pending = list(range(len(steps)))
+        running = {}
+        
+        while pending or running:
+            # Submit every step whose dependencies have all finished
+            ready = [
+                index for index in pending
+                if all(results[dep] is not None for dep in dependencies[index])
+            ]
+            if not ready and not running:
+                # Dependency cycle - run the next step in plan order
+                ready = [pending[0]]
+            
+            for index in ready:
+                pending.remove(index)
+                future = self.pool.submit(self._execute_step, steps[index], index, results, speculation)
+                running[future] = index
             
-            # Store result for context in next steps
-            step_num = step.get("step_number", len(results))
-            execution_context[f"step_{step_num}"] = step_result
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
         
-        return {
+        execution_result = {
             "status": "success",
             "steps_executed": len(results),
-            "results": results,
-            "execution_context": execution_context
+            "results": [step_result.to_dict() for step_result in results]
+        }
+        
+        if speculation is not None:
+            # Whatever no step claimed was wasted work
+            for future in speculation.values():
+                future.cancel()
+            execution_result["speculation"] = {
+                "reused": sum(1 for r in results if r.speculative),
+                "discarded": len(speculation)
+            }
+        
+        return execution_result
+    
+    def tool_schemas(self) -> List[Dict[str, Any]]:
+        """
+        Describe the registered tools as OpenAI function-calling schemas
+        
+        Returns:
+            One function schema per registered tool
+        """
+        schemas = []
+        for factory in self.tool_factories.values():
+            # Read the class attributes so tools are still only built when called
+            tool_class = getattr(factory, "func", factory)
+            schemas.append({
+                "type": "function",
+                "function": {
+                    "name": tool_class.name,
+                    "description": tool_class.description,
+                    "parameters": tool_class.parameters
+                }
+            })
+        return schemas
+    
+    def close(self) -> None:
+        """Stop the worker pool and close tool HTTP connections"""
+        self.pool.shutdown(wait=False)
+        for tool in self._tools.values():
+            tool.close()
+        self.session.close()
+    
+    def _build_dependencies(self, steps: List[Dict[str, Any]]) -> List[Set[int]]:
+        """
+        Find which other steps each step depends on
+        
+        Combines the planner's explicit depends_on list with any
+        ${step_N} references found in the step params.
+        
+        Args:
+            steps: Planned steps
+            
+        Returns:
+            Plan positions each step depends on, by plan position
+        """
+        positions = {
+            str(self._step_number(step, index)): index
+            for index, step in enumerate(steps)
         }
+        dependencies = []
+        
+        for index, step in enumerate(steps):
+            referenced = [match.group(1) for match in STEP_REFERENCE_PATTERN.finditer(str(step.get("params", {})))]
+            referenced.extend(str(dep) for dep in step.get("depends_on", []))
+            
+            step_deps = {positions[ref] for ref in referenced if ref in positions}
+            step_deps.discard(index)
+            dependencies.append(step_deps)
+        
+        return dependencies
+    
+    def _step_number(self, step: Dict[str, Any], index: int) -> Any:
+        """Step number as planned, or the step's 1-based plan position if it has none"""
+        return step.get("step_number", index + 1)
+    
+    def _resolve_params(self, params: Any, results: List[Optional[StepResult]]) -> Any:
+        """
+        Substitute ${step_N.path} references with outputs of earlier steps
+        
+        A string that is exactly one reference is replaced by the referenced
+        value itself; references embedded in longer strings are interpolated.
+        
+        Args:
+            params: Step params (or a nested value within them)
+            results: Step results by plan position
+            
+        Returns:
+            Params with references resolved
+        """
+        if isinstance(params, dict):
+            return {key: self._resolve_params(value, results) for key, value in params.items()}
+        if isinstance(params, list):
+            return [self._resolve_params(value, results) for value in params]
+        if not isinstance(params, str) or "${step_" not in params:
+            return params
+        
+        whole = STEP_REFERENCE_PATTERN.fullmatch(params)
+        if whole:
+            return self._lookup_reference(whole, results)
+        return STEP_REFERENCE_PATTERN.sub(lambda m: str(self._lookup_reference(m, results)), params)
+    
+    def _lookup_reference(self, match: "re.Match", results: List[Optional[StepResult]]) -> Any:
+        """
+        Resolve one ${step_N.path} match against the finished step results
+        
+        A bare ${step_N} stands for the step's tool result; a path walks the
+        step record, as in ${step_N.result.field}.
+        """
+        step_ref = match.group(1)
+        step_result = next(
+            (r for r in results if r is not None and str(r.step_number) == step_ref),
+            None
+        )
+        if step_result is None:
+            raise ValueError(f"Step {step_ref} has no result to reference")
+        
+        path = match.group(2)
+        if not path:
+            return step_result.result
+        
+        value = step_result.to_dict()
+        for part in path.split(".")[1:]:
+            if isinstance(value, list) and part.isdigit():
+                value = value[int(part)]
+            elif isinstance(value, dict) and part in value:
+                value = value[part]
+            else:
+                raise ValueError(f"Cannot resolve reference {match.group()}")
+        return value
     
-    def _execute_step(self, step: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    def _execute_step(
+        self,
+        step: Dict[str, Any],
+        index: int,
+        results: List[Optional[StepResult]],
+        speculation: Optional[Dict[Tuple[str, str], Future]] = None
+    ) -> StepResult:
         """
         Execute a single step
         
         Args:
             step: Step to execute
-            context: Execution context from previous steps
+            index: Step's position in the plan
+            results: Step results by plan position, used to resolve references
+            speculation: In-flight tool calls that this step may claim
             
         Returns:
             Step execution result
         """
-        step_num = step.get("step_number", "unknown")
+        step_num = self._step_number(step, index)
         tool_name = step.get("tool", "none")
         
-        self.logger.info(f"Executing step {step_num}: {step.get('description', 'unknown')}")
+        self.logger.info("Executing step %s: %s", step_num, step.get('description', 'unknown'))
         
         if tool_name == "none":
-            return {
-                "step_number": step_num,
-                "status": "skipped",
-                "description": step.get("description"),
-                "reason": "No tool required"
-            }
+            return StepResult(
+                step_number=step_num,
+                status="skipped",
+                description=step.get("description"),
+                reason="No tool required"
+            )
         
-        if tool_name not in self.tools:
-            return {
-                "step_number": step_num,
-                "status": "error",
-                "error": f"Unknown tool: {tool_name}",
-                "description": step.get("description")
-            }
+        if tool_name not in self.tool_factories:
+            return StepResult(
+                step_number=step_num,
+                status="error",
+                error=f"Unknown tool: {tool_name}",
+                description=step.get("description")
+            )
         
         try:
-            tool = self.tools[tool_name]
-            params = step.get("params", {})
+            tool = self._get_tool(tool_name)
+            params = self._resolve_params(step.get("params", {}), results)
             
-            self.logger.debug(f"Calling tool {tool_name} with params: {params}")
-            result = tool.execute(**params)
+            speculative_call = None
+            if speculation is not None:
+                speculative_call = speculation.pop(self._speculation_key(tool_name, params), None)
             
-            return {
-                "step_number": step_num,
-                "status": "completed",
-                "description": step.get("description"),
-                "tool": tool_name,
-                "params": params,
-                "result": result
-            }
+            if speculative_call is not None:
+                self.logger.debug("Reusing speculative call to %s with params: %s", tool_name, params)
+                result = speculative_call.result()
+            else:
+                self.logger.debug("Calling tool %s with params: %s", tool_name, params)
+                result = tool.execute(**params)
+            
+            return StepResult(
+                step_number=step_num,
+                status="completed",
+                description=step.get("description"),
+                tool=tool_name,
+                params=params,
+                result=result,
+                speculative=True if speculative_call is not None else None
+            )
         except Exception as e:
-            self.logger.error(f"Error executing step {step_num}: {str(e)}")
-            return {
-                "step_number": step_num,
-                "status": "failed",
-                "description": step.get("description"),
-                "tool": tool_name,
-                "error": str(e)
-            }
+            self.logger.error("Error executing step %s: %s", step_num, e)
+            return StepResult(
+                step_number=step_num,
+                status="failed",
+                description=step.get("description"),
+                tool=tool_name,
+                error=str(e)
+            )
+    
+    def _get_tool(self, tool_name: str) -> BaseTool:
+        """
+        Get a tool instance, constructing it on first use
+        
+        Args:
+            tool_name: Registered tool name
+            
+        Returns:
+            Shared tool instance
+        """
+        tool = self._tools.get(tool_name)
+        if tool is None:
+            # setdefault keeps a single instance if two steps race on first use
+            tool = self._tools.setdefault(tool_name, self.tool_factories[tool_name]())
+        return tool
+    
+    def _call_tool(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a tool directly, outside of any plan step"""
+        return self._get_tool(tool_name).execute(**params)
+    
+    def _speculation_key(self, tool_name: str, params: Dict[str, Any]) -> Tuple[str, str]:
+        """Key identifying a tool call by tool name and canonicalized params"""
+        return tool_name, json.dumps(params, sort_keys=True, default=str)
@@ -1,14 +1,199 @@
 """Planner Agent - converts user input into structured plan"""
+import copy
 import json
 import logging
 import re
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, List, Optional
 
+from cachetools import TTLCache
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from config import Config
 from llm import OpenAIClient
 from .base import BaseAgent
 
 logger = logging.getLogger(__name__)
 
+COMMON_CITIES = frozenset({
+    'london', 'paris', 'tokyo', 'new york', 'san francisco',
+    'berlin', 'sydney', 'toronto', 'dubai', 'singapore',
+    'mumbai', 'moscow', 'bangkok', 'los angeles',
+    'chicago', 'seattle', 'amsterdam', 'barcelona', 'madrid'
+})
+LANGUAGE_KEYWORDS = frozenset({'python', 'javascript', 'java', 'go', 'rust', 'typescript', 'c++', 'php', 'ruby'})
+GITHUB_KEYWORDS = LANGUAGE_KEYWORDS | {
+    'github', 'repository', 'repositories', 'repo', 'repos', 'node',
+    'library', 'libraries', 'framework', 'frameworks'
+}
+
+
+def _compile_keyword_pattern(keywords) -> "re.Pattern":
+    """Compile keywords into one alternation, longest first, matched on word boundaries"""
+    alternatives = "|".join(re.escape(k) for k in sorted(keywords, key=lambda k: (-len(k), k)))
+    return re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)")
+
+
+# Single-pass scanners replacing one substring search per keyword
+CITY_PATTERN = _compile_keyword_pattern(COMMON_CITIES)
+LANGUAGE_PATTERN = _compile_keyword_pattern(LANGUAGE_KEYWORDS)
+GITHUB_PATTERN = _compile_keyword_pattern(GITHUB_KEYWORDS)
+
+# Static planning instructions. Kept byte-identical across calls and placed
+# first in the message list so the provider's automatic prompt cache can
+# reuse the prefix; only the short task message changes per request.
+PLANNER_SYSTEM_PROMPT = """You are an AI planning agent. Your task is to break down user requests into concrete, actionable steps with required tools.
+
+Available tools:
+1. github_search_repos - Search GitHub repositories by query
+   Params:
+   - query (string, required): GitHub search query, e.g. "language:python stars:>1000",
+     "topic:framework language:javascript", "machine learning in:description"
+   - max_results (integer, optional, default 10): Maximum number of repositories to return (1-100)
+   Returns: list of repositories with name, url, description, stars, language, owner, forks, updated_at
+2. get_weather - Get current weather information for a city
+   Params:
+   - city (string, required): City name, e.g. "London", "New York", "Tokyo"
+   - units (string, optional, default "metric"): "metric" (Celsius) or "imperial" (Fahrenheit)
+   Returns: city, country, description, temperature, feels_like, humidity, pressure, wind_speed, cloudiness
+3. none - For informational tasks that don't need external tools
+   Params: {}
+
+Create a JSON plan with the following structure:
+{
+    "task": "Original task",
+    "objective": "Clear objective",
+    "steps": [
+        {
+            "step_number": 1,
+            "description": "What to do",
+            "tool": "Tool name or 'none'",
+            "params": {"param1": "value1"},
+            "depends_on": [],
+            "expected_outcome": "What we expect"
+        }
+    ],
+    "success_criteria": "How to know if successful"
+}
+
+Planning rules:
+- Number steps consecutively starting at 1.
+- Use one get_weather step per city; never combine several cities into one step.
+- Use one github_search_repos step per distinct search; put language, topic and star
+  filters into the query string rather than the description.
+- When the user asks for "top N" results, set max_results to N.
+- "depends_on" lists the step_numbers whose output a step consumes. Leave it empty
+  when a step does not use a prior step's output, so independent steps can run in parallel.
+- Refer to a prior step's tool result in params as "${step_N}", or to one field of it
+  as "${step_N.result.field}", and list N in depends_on.
+- Use the tool "none" with empty params only when no tool can help with the task.
+- Only use the tools listed above; never invent tool names or params.
+
+Example 1
+Task: Find the top 3 Python machine learning repositories and the weather in Paris
+{
+    "task": "Find the top 3 Python machine learning repositories and the weather in Paris",
+    "objective": "List popular Python ML repositories and report current weather in Paris",
+    "steps": [
+        {
+            "step_number": 1,
+            "description": "Search GitHub for popular Python machine learning repositories",
+            "tool": "github_search_repos",
+            "params": {"query": "machine learning language:python", "max_results": 3},
+            "depends_on": [],
+            "expected_outcome": "Three most-starred Python ML repositories"
+        },
+        {
+            "step_number": 2,
+            "description": "Get current weather in Paris",
+            "tool": "get_weather",
+            "params": {"city": "Paris", "units": "metric"},
+            "depends_on": [],
+            "expected_outcome": "Current weather conditions for Paris"
+        }
+    ],
+    "success_criteria": "Three repositories listed and Paris weather reported"
+}
+
+Example 2
+Task: What's the weather like in Tokyo and Sydney in Fahrenheit?
+{
+    "task": "What's the weather like in Tokyo and Sydney in Fahrenheit?",
+    "objective": "Report current weather in Tokyo and Sydney using imperial units",
+    "steps": [
+        {
+            "step_number": 1,
+            "description": "Get current weather in Tokyo",
+            "tool": "get_weather",
+            "params": {"city": "Tokyo", "units": "imperial"},
+            "depends_on": [],
+            "expected_outcome": "Current weather conditions for Tokyo in Fahrenheit"
+        },
+        {
+            "step_number": 2,
+            "description": "Get current weather in Sydney",
+            "tool": "get_weather",
+            "params": {"city": "Sydney", "units": "imperial"},
+            "depends_on": [],
+            "expected_outcome": "Current weather conditions for Sydney in Fahrenheit"
+        }
+    ],
+    "success_criteria": "Weather reported for both cities in Fahrenheit"
+}
+
+Example 3
+Task: Explain what a REST API is
+{
+    "task": "Explain what a REST API is",
+    "objective": "Provide a short explanation of REST APIs",
+    "steps": [
+        {
+            "step_number": 1,
+            "description": "Explain the concept of a REST API",
+            "tool": "none",
+            "params": {},
+            "depends_on": [],
+            "expected_outcome": "Clear explanation of REST APIs"
+        }
+    ],
+    "success_criteria": "User receives an accurate explanation"
+}
+
+Only return valid JSON, no other text."""
+
+
+class PlanStep(BaseModel):
+    """Schema for a single plan step"""
+    model_config = ConfigDict(extra="allow")
+    
+    step_number: int
+    description: str
+    tool: str = "none"
+    params: Dict[str, Any] = {}
+    depends_on: List[int] = []
+    expected_outcome: Optional[str] = None
+
+
+class Plan(BaseModel):
+    """Schema for a plan produced by the LLM"""
+    model_config = ConfigDict(extra="allow")
+    
+    task: str
+    objective: str
+    steps: List[PlanStep] = Field(min_length=1)
+    success_criteria: str
+    
+    @field_validator("steps", mode="before")
+    @classmethod
+    def number_steps(cls, steps: Any) -> Any:
+        """Default missing step numbers to the step's position in the plan"""
+        if not isinstance(steps, list):
+            return steps
+        return [
+            {"step_number": index + 1, **step} if isinstance(step, dict) else step
+            for index, step in enumerate(steps)
+        ]
+
 
 class PlannerAgent(BaseAgent):
     """Agent that plans steps for executing a user task"""
@@ -20,8 +205,15 @@ class PlannerAgent(BaseAgent):
             self.llm = OpenAIClient()
             self.llm_available = True
         except Exception as e:
-            logger.warning(f"LLM not available, using fallback planner: {e}")
+            logger.warning("LLM not available, using fallback planner: %s", e)
             self.llm_available = False
+        
+        # LLM plans keyed by normalized task text
+        self.plan_cache = TTLCache(maxsize=Config.PLAN_CACHE_SIZE, ttl=Config.PLAN_CACHE_TTL)
+        self._cache_lock = threading.Lock()
+        
+        # The static half of every planning request, built once
+        self._system_message = {"role": "system", "content": PLANNER_SYSTEM_PROMPT}
     
     def execute(self, user_task: str) -> Dict[str, Any]:
         """
@@ -33,132 +225,233 @@ class PlannerAgent(BaseAgent):
         Returns:
             Structured plan with steps and required tools
         """
-        self.logger.info(f"Planning task: {user_task}")
+        self.logger.info("Planning task: %s", user_task)
         
         # Try LLM first, fall back to rule-based planning
         if self.llm_available:
             try:
                 return self._llm_based_planning(user_task)
             except Exception as e:
-                self.logger.warning(f"LLM planning failed: {e}, using fallback")
-                return self._rule_based_planning(user_task)
-        else:
-            return self._rule_based_planning(user_task)
+                self.logger.warning("LLM planning failed: %s, using fallback", e)
+        return self._rule_based_planning(user_task)
+    
+    async def execute_async(self, user_task: str) -> Dict[str, Any]:
+        """
+        Convert user task into a structured plan without blocking the event loop
+        
+        Args:
+            user_task: Natural language task from user
+            
+        Returns:
+            Structured plan with steps and required tools
+        """
+        self.logger.info("Planning task: %s", user_task)
+        
+        # Try LLM first, fall back to rule-based planning
+        if self.llm_available:
+            try:
+                return await self._llm_based_planning_async(user_task)
+            except Exception as e:
+                self.logger.warning("LLM planning failed: %s, using fallback", e)
+        return self._rule_based_planning(user_task)
     
     def _llm_based_planning(self, user_task: str) -> Dict[str, Any]:
         """Use LLM for intelligent planning"""
-        plan_prompt = self._create_plan_prompt(user_task)
-        messages = [
-            {
-                "role": "system",
-                "content": "You are an AI planning agent. Your task is to break down user requests into concrete, actionable steps with required tools."
-            },
+        cached = self._get_cached_plan(user_task)
+        if cached is not None:
+            return cached
+        
+        plan_json = self.llm.create_message_json(self._create_plan_messages(user_task), temperature=0.3)
+        return self._accept_llm_plan(user_task, plan_json)
+    
+    async def _llm_based_planning_async(self, user_task: str) -> Dict[str, Any]:
+        """Use LLM for intelligent planning via the async client"""
+        cached = self._get_cached_plan(user_task)
+        if cached is not None:
+            return cached
+        
+        plan_json = await self.llm.create_message_json_async(self._create_plan_messages(user_task), temperature=0.3)
+        return self._accept_llm_plan(user_task, plan_json)
+    
+    def _accept_llm_plan(self, user_task: str, plan_json: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate and cache a plan returned by the LLM
+        
+        Args:
+            user_task: User's task
+            plan_json: Parsed LLM response
+            
+        Returns:
+            Planning result
+        """
+        plan = self._validate_plan(plan_json)
+        self._cache_plan(user_task, plan)
+        self.logger.info("Generated LLM plan with %s steps", len(plan['steps']))
+        return {"status": "success", "plan": plan, "source": "llm"}
+    
+    def _get_cached_plan(self, user_task: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a previously generated LLM plan for the same task
+        
+        Args:
+            user_task: User's task
+            
+        Returns:
+            Planning result, or None on a cache miss
+        """
+        with self._cache_lock:
+            plan = self.plan_cache.get(self._normalize_task(user_task))
+        
+        if plan is None:
+            return None
+        
+        self.logger.info("Using cached plan")
+        return {"status": "success", "plan": copy.deepcopy(plan), "source": "llm"}
+    
+    def _cache_plan(self, user_task: str, plan: Dict[str, Any]) -> None:
+        """Store a validated LLM plan for reuse"""
+        # TTLCache rejects every insert when maxsize is 0, so a size of 0 skips caching
+        if Config.PLAN_CACHE_SIZE < 1:
+            return
+        
+        with self._cache_lock:
+            self.plan_cache[self._normalize_task(user_task)] = copy.deepcopy(plan)
+    
+    def _normalize_task(self, user_task: str) -> str:
+        """Normalize case and whitespace so trivially different tasks share a cache entry"""
+        return " ".join(user_task.lower().split())
+    
+    def _create_plan_messages(self, user_task: str) -> List[Dict[str, str]]:
+        """Build the chat messages for an LLM planning call"""
+        return [
+            self._system_message,
             {
                 "role": "user",
-                "content": plan_prompt
+                "content": self._create_plan_prompt(user_task)
             }
         ]
+    
+    def speculative_steps(self, user_task: str) -> List[Dict[str, Any]]:
+        """
+        Guess the tool steps a plan for this task will likely contain
         
-        try:
-            plan_json = self.llm.create_message_json(messages, temperature=0.3)
-            plan = self._validate_plan(plan_json)
-            self.logger.info(f"Generated LLM plan with {len(plan['steps'])} steps")
-            return {"status": "success", "plan": plan}
-        except Exception as e:
-            self.logger.error(f"Error in LLM planner: {str(e)}")
-            raise
+        Uses the rule-based extractor so tool calls can start while the
+        LLM planner is still running. Only weather lookups are guessed: the
+        LLM reliably plans the same city and units, while its GitHub queries
+        rarely match the rule-based ones and the speculative call is wasted
+        quota. Returns no steps when the task already has a cached LLM plan,
+        since planning will then be instant.
+        
+        Args:
+            user_task: Natural language task from user
+            
+        Returns:
+            Likely tool steps
+        """
+        if not self.llm_available:
+            return []
+        
+        with self._cache_lock:
+            if self._normalize_task(user_task) in self.plan_cache:
+                return []
+        
+        steps = self._rule_based_steps(user_task.lower())
+        return [step for step in steps if step["tool"] == "get_weather"]
     
     def _rule_based_planning(self, user_task: str) -> Dict[str, Any]:
         """Fallback rule-based planning when LLM quota is exhausted"""
         self.logger.info("Using rule-based fallback planner")
         
-        task_lower = user_task.lower()
+        steps = self._rule_based_steps(user_task.lower())
+        
+        # If no tools detected, add a generic info step
+        if not steps:
+            steps.append({
+                "step_number": 1,
+                "description": "Analyze task and provide information",
+                "tool": "none",
+                "params": {},
+                "depends_on": [],
+                "expected_outcome": "Task analysis and recommendations"
+            })
+        
+        plan = {
+            "task": user_task,
+            "objective": f"Complete: {user_task}",
+            "steps": steps,
+            "success_criteria": "All steps executed successfully"
+        }
+        
+        self.logger.info("Generated rule-based plan with %s steps", len(plan['steps']))
+        return {"status": "success", "plan": plan, "source": "rules"}
+    
+    def _rule_based_steps(self, task_lower: str) -> List[Dict[str, Any]]:
+        """Build tool steps from keywords in the lower-cased task"""
         steps = []
         step_num = 1
         
         # Detect GitHub-related keywords
-        if any(keyword in task_lower for keyword in ['github', 'repository', 'repo', 'python', 'javascript', 'java', 'go', 'rust', 'node', 'libraries', 'frameworks', 'repositories']):
+        if GITHUB_PATTERN.search(task_lower):
             # Extract query from task
-            query = self._extract_search_query(user_task)
+            query = self._extract_search_query(task_lower)
             steps.append({
                 "step_number": step_num,
                 "description": f"Search GitHub for: {query}",
                 "tool": "github_search_repos",
                 "params": {"query": query, "max_results": 5},
+                "depends_on": [],
                 "expected_outcome": "List of matching repositories with stars and descriptions"
             })
             step_num += 1
         
         # Detect weather-related keywords
-        cities = self._extract_cities(user_task)
+        cities = self._extract_cities(task_lower)
         for city in cities:
             steps.append({
                 "step_number": step_num,
                 "description": f"Get current weather in {city}",
                 "tool": "get_weather",
                 "params": {"city": city, "units": "metric"},
+                "depends_on": [],
                 "expected_outcome": f"Current weather conditions for {city}"
             })
             step_num += 1
         
-        # If no tools detected, add a generic info step
-        if not steps:
-            steps.append({
-                "step_number": 1,
-                "description": "Analyze task and provide information",
-                "tool": "none",
-                "params": {},
-                "expected_outcome": "Task analysis and recommendations"
-            })
-        
-        plan = {
-            "task": user_task,
-            "objective": f"Complete: {user_task}",
-            "steps": steps,
-            "success_criteria": "All steps executed successfully"
-        }
-        
-        self.logger.info(f"Generated rule-based plan with {len(plan['steps'])} steps")
-        return {"status": "success", "plan": plan}
+        return steps
     
-    def _extract_search_query(self, task: str) -> str:
-        """Extract search query from task description"""
+    def _extract_search_query(self, task_lower: str) -> str:
+        """Extract search query from lower-cased task description"""
         # Try to find specific language or topic mentions
-        keywords = ['python', 'javascript', 'java', 'go', 'rust', 'typescript', 'c++', 'php', 'ruby']
-        for keyword in keywords:
-            if keyword in task.lower():
-                # Extract more context around the keyword
-                if 'framework' in task.lower():
-                    return f"language:{keyword} topic:framework"
-                elif 'library' in task.lower() or 'library' in task.lower():
-                    return f"language:{keyword} topic:library"
-                else:
-                    return f"language:{keyword} stars:>1000"
+        match = LANGUAGE_PATTERN.search(task_lower)
+        if match:
+            keyword = match.group()
+            # Extract more context around the keyword
+            if 'framework' in task_lower:
+                return f"language:{keyword} topic:framework"
+            elif 'library' in task_lower or 'libraries' in task_lower:
+                return f"language:{keyword} topic:library"
+            else:
+                return f"language:{keyword} stars:>1000"
         
         # Default general search
         return "stars:>10000 sort:stars"
     
-    def _extract_cities(self, task: str) -> List[str]:
-        """Extract city names from task description"""
-        common_cities = [
-            'london', 'paris', 'tokyo', 'new york', 'san francisco',
-            'berlin', 'sydney', 'toronto', 'dubai', 'singapore',
-            'mumbai', 'moscow', 'bangkok', 'bangkok', 'los angeles',
-            'chicago', 'seattle', 'amsterdam', 'barcelona', 'madrid'
-        ]
-        
+    def _extract_cities(self, task_lower: str) -> List[str]:
+        """Extract city names from lower-cased task description"""
         cities_found = []
-        task_lower = task.lower()
         
-        for city in common_cities:
-            if city in task_lower:
-                cities_found.append(city.title())
+        for match in CITY_PATTERN.finditer(task_lower):
+            city = match.group().title()
+            if city not in cities_found:
+                cities_found.append(city)
         
         return cities_found
     
     def _create_plan_prompt(self, user_task: str) -> str:
         """
-        Create the planning prompt
+        Create the per-task part of the planning prompt
+        
+        Tool catalog, schema and examples live in PLANNER_SYSTEM_PROMPT.
         
         Args:
             user_task: User's task
@@ -166,32 +459,7 @@ class PlannerAgent(BaseAgent):
         Returns:
             Formatted prompt for the LLM
         """
-        return f"""
-Task: {user_task}
-
-Available tools:
-1. github_search_repos - Search GitHub repositories by query
-2. get_weather - Get current weather information for a city
-3. none - For informational tasks that don't need external tools
-
-Please create a JSON plan with the following structure:
-{{
-    "task": "Original task",
-    "objective": "Clear objective",
-    "steps": [
-        {{
-            "step_number": 1,
-            "description": "What to do",
-            "tool": "Tool name or 'none'",
-            "params": {{"param1": "value1"}},
-            "expected_outcome": "What we expect"
-        }}
-    ],
-    "success_criteria": "How to know if successful"
-}}
-
-Only return valid JSON, no other text.
-"""
+        return f"Task: {user_task}"
     
     def _validate_plan(self, plan: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -202,14 +470,48 @@ Only return valid JSON, no other text.
             
         Returns:
             Validated plan
+            
+        Raises:
+            ValueError: If the plan does not match the Plan schema or its
+                dependencies are invalid (pydantic's ValidationError is a ValueError)
         """
-        required_fields = ["task", "objective", "steps", "success_criteria"]
+        plan = Plan.model_validate(plan).model_dump()
         
-        for field in required_fields:
-            if field not in plan:
-                raise ValueError(f"Missing required field in plan: {field}")
+        step_numbers = {step["step_number"] for step in plan["steps"]}
+        for step in plan["steps"]:
+            for dep in step["depends_on"]:
+                if dep not in step_numbers:
+                    raise ValueError(f"Step {step['step_number']} depends on unknown step: {dep}")
         
-        if not isinstance(plan["steps"], list) or len(plan["steps"]) == 0:
-            raise ValueError("Plan must have at least one step")
+        self._check_acyclic(plan["steps"])
         
         return plan
+    
+    def _check_acyclic(self, steps: List[Dict[str, Any]]) -> None:
+        """
+        Check that step dependencies form a DAG using Kahn's algorithm
+        
+        Args:
+            steps: Plan steps with depends_on lists
+            
+        Raises:
+            ValueError: If the dependencies contain a cycle
+        """
+        in_degree = {step["step_number"]: len(set(step["depends_on"])) for step in steps}
+        dependents = {step["step_number"]: [] for step in steps}
+        for step in steps:
+            for dep in set(step["depends_on"]):
+                dependents[dep].append(step["step_number"])
+        
+        ready = [num for num, degree in in_degree.items() if degree == 0]
+        visited = 0
+        while ready:
+            num = ready.pop()
+            visited += 1
+            for dependent in dependents[num]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+        
+        if visited != len(in_degree):
+            raise ValueError("Plan step dependencies contain a cycle")
@@ -1,13 +1,40 @@
 """Verifier Agent - validates and fixes results"""
-import json
 import logging
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
+
+import orjson
 
 from llm import OpenAIClient
 from .base import BaseAgent
 
 logger = logging.getLogger(__name__)
 
+# Step statuses that count towards plan completion
+SUCCESSFUL_STATUSES = frozenset({"completed", "skipped"})
+
+# Static formatting instructions, kept apart from the per-task plan and results in the
+# user message. At roughly 200 tokens this prefix is below the 1024-token minimum for
+# the provider's prompt caching, so unlike the planner prompt it is not cached.
+VERIFIER_SYSTEM_PROMPT = """You are an expert at formatting and summarizing technical results. Create a clear, structured summary.
+
+You receive a task, its objective, its success criteria and the JSON results of each
+executed step. Step results have a "status" of "completed", "skipped", "failed" or "error".
+A completed step carries the raw tool output under "result"; tool outputs with
+"status": "error" describe an API failure.
+
+Please create a clear, structured summary of:
+1. What was accomplished
+2. Key findings or data obtained
+3. Any issues encountered
+4. Next steps if needed
+
+Formatting guidelines:
+- For GitHub repositories, list name, stars and a one-line description.
+- For weather, give city, temperature with units, conditions and humidity.
+- Report failed steps plainly with their error message; do not invent data.
+
+Be concise but comprehensive."""
+
 
 class VerifierAgent(BaseAgent):
     """Agent that verifies and validates results"""
@@ -19,16 +46,22 @@ class VerifierAgent(BaseAgent):
             self.llm = OpenAIClient()
             self.llm_available = True
         except Exception as e:
-            logger.warning(f"LLM not available for formatting: {e}")
+            logger.warning("LLM not available for formatting: %s", e)
             self.llm_available = False
     
-    def execute(self, plan: Dict[str, Any], execution_result: Dict[str, Any]) -> Dict[str, Any]:
+    def execute(
+        self,
+        plan: Dict[str, Any],
+        execution_result: Dict[str, Any],
+        on_summary_chunk: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
         """
         Verify and validate execution results
         
         Args:
             plan: Original plan
             execution_result: Result from Executor Agent
+            on_summary_chunk: Optional callback receiving the LLM summary as it streams
             
         Returns:
             Validated and formatted final result
@@ -42,7 +75,11 @@ class VerifierAgent(BaseAgent):
             self.logger.warning("Not all steps were completed")
         
         # Format final answer
-        final_answer = self._create_final_answer(plan, execution_result, completion_check)
+        final_answer = self._create_final_answer(plan, execution_result, completion_check, on_summary_chunk)
+        
+        # Surface speculative tool calls that ran but were not part of the final plan
+        if "speculation" in execution_result:
+            final_answer["speculation"] = execution_result["speculation"]
         
         return {
             "status": "success" if completion_check["all_steps_completed"] else "partial",
@@ -61,13 +98,14 @@ class VerifierAgent(BaseAgent):
         Returns:
             Completion status
         """
+        results = execution_result.get("results", [])
         expected_steps = len(plan.get("steps", []))
-        executed_steps = len(execution_result.get("results", []))
+        executed_steps = len(results)
         
-        successful_steps = sum(
-            1 for r in execution_result.get("results", [])
-            if r.get("status") in ["completed", "skipped"]
-        )
+        successful_steps = 0
+        for r in results:
+            if r.get("status") in SUCCESSFUL_STATUSES:
+                successful_steps += 1
         
         all_completed = successful_steps == expected_steps
         
@@ -82,7 +120,8 @@ class VerifierAgent(BaseAgent):
         self,
         plan: Dict[str, Any],
         execution_result: Dict[str, Any],
-        completion_check: Dict[str, Any]
+        completion_check: Dict[str, Any],
+        on_summary_chunk: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         Create a formatted final answer
@@ -91,6 +130,7 @@ class VerifierAgent(BaseAgent):
             plan: Original plan
             execution_result: Execution results
             completion_check: Completion status
+            on_summary_chunk: Optional callback receiving the LLM summary as it streams
             
         Returns:
             Formatted final answer
@@ -98,9 +138,9 @@ class VerifierAgent(BaseAgent):
         # Try LLM formatting, fall back to manual formatting
         if self.llm_available:
             try:
-                return self._llm_format_answer(plan, execution_result, completion_check)
+                return self._llm_format_answer(plan, execution_result, completion_check, on_summary_chunk)
             except Exception as e:
-                self.logger.warning(f"LLM formatting failed: {e}, using fallback")
+                self.logger.warning("LLM formatting failed: %s, using fallback", e)
                 return self._manual_format_answer(plan, execution_result, completion_check)
         else:
             return self._manual_format_answer(plan, execution_result, completion_check)
@@ -109,14 +149,15 @@ class VerifierAgent(BaseAgent):
         self,
         plan: Dict[str, Any],
         execution_result: Dict[str, Any],
-        completion_check: Dict[str, Any]
+        completion_check: Dict[str, Any],
+        on_summary_chunk: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
-        """LLM-based formatting"""
+        """LLM-based formatting, streamed to on_summary_chunk when given"""
         format_prompt = self._create_format_prompt(plan, execution_result)
         messages = [
             {
                 "role": "system",
-                "content": "You are an expert at formatting and summarizing technical results. Create a clear, structured summary."
+                "content": VERIFIER_SYSTEM_PROMPT
             },
             {
                 "role": "user",
@@ -125,7 +166,14 @@ class VerifierAgent(BaseAgent):
         ]
         
         try:
-            formatted_response = self.llm.create_message(messages, temperature=0.2)
+            if on_summary_chunk is None:
+                formatted_response = self.llm.create_message(messages, temperature=0.2)
+            else:
+                chunks = []
+                for chunk in self.llm.create_message_stream(messages, temperature=0.2):
+                    chunks.append(chunk)
+                    on_summary_chunk(chunk)
+                formatted_response = "".join(chunks)
             
             return {
                 "task": plan.get("task"),
@@ -136,7 +184,7 @@ class VerifierAgent(BaseAgent):
                 "raw_results": execution_result.get("results", [])
             }
         except Exception as e:
-            self.logger.error(f"Error formatting with LLM: {str(e)}")
+            self.logger.error("Error formatting with LLM: %s", e)
             raise
     
     def _manual_format_answer(
@@ -146,17 +194,14 @@ class VerifierAgent(BaseAgent):
         completion_check: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Manual formatting when LLM is not available"""
-        # Build summary from raw results
-        summary_parts = []
-        summary_parts.append(f"Task: {plan.get('task')}")
-        summary_parts.append("\nResults:")
-        
-        for result in execution_result.get("results", []):
-            step_num = result.get("step_number")
-            description = result.get("description")
+        results = execution_result.get("results", [])
+        
+        # Build summary from raw results; parts are joined once at the end
+        summary_parts = [f"Task: {plan.get('task')}", "\nResults:"]
+        
+        for result in results:
             status = result.get("status")
-            
-            summary_parts.append(f"\nStep {step_num}: {description} [{status}]")
+            summary_parts.append(f"\nStep {result.get('step_number')}: {result.get('description')} [{status}]")
             
             # Add result details
             if status == "completed" and "result" in result:
@@ -166,35 +211,38 @@ class VerifierAgent(BaseAgent):
                     # GitHub search results
                     if "results" in result_data and result_data.get("count"):
                         summary_parts.append(f"  Found {result_data['count']} items:")
-                        for item in result_data.get("results", [])[:3]:  # Show top 3
+                        for item in result_data["results"][:3]:  # Show top 3
                             if "name" in item:  # GitHub repo
                                 summary_parts.append(f"    - {item['name']}: {item.get('stars', 0)} stars")
-                            elif "temperature" in item:  # Weather (handled below)
-                                pass
                     
                     # Weather results
                     if "weather" in result_data:
                         w = result_data["weather"]
-                        city = result_data.get("city")
-                        summary_parts.append(f"  {city}: {w['temperature']}°C, {w['description']}")
+                        summary_parts.append(f"  {result_data.get('city')}: {w['temperature']}°C, {w['description']}")
                 else:
                     summary_parts.append(f"  Error: {result_data.get('error')}")
         
         summary_parts.append(f"\n\nCompletion: {completion_check['successful_steps']}/{completion_check['expected_steps']} steps")
         
+        discarded = execution_result.get("speculation", {}).get("discarded", 0)
+        if discarded:
+            summary_parts.append(f"Speculative tool calls discarded: {discarded}")
+        
         return {
             "task": plan.get("task"),
             "objective": plan.get("objective"),
             "success_criteria": plan.get("success_criteria"),
             "completion": completion_check,
             "summary": "\n".join(summary_parts),
-            "raw_results": execution_result.get("results", []),
+            "raw_results": results,
             "note": "(Using fallback formatter - LLM quota exhausted)"
         }
     
     def _create_format_prompt(self, plan: Dict[str, Any], execution_result: Dict[str, Any]) -> str:
         """
-        Create the formatting prompt
+        Create the per-task part of the formatting prompt
+        
+        Summary instructions live in VERIFIER_SYSTEM_PROMPT.
         
         Args:
             plan: Original plan
@@ -203,21 +251,15 @@ class VerifierAgent(BaseAgent):
         Returns:
             Formatted prompt for LLM
         """
-        results_json = json.dumps(execution_result.get("results", []), indent=2)
+        results_json = orjson.dumps(
+            execution_result.get("results", []),
+            option=orjson.OPT_INDENT_2
+        ).decode()
         
-        return f"""
-Task: {plan.get('task')}
+        return f"""Task: {plan.get('task')}
 Objective: {plan.get('objective')}
 Success Criteria: {plan.get('success_criteria')}
 
 Execution Results:
 {results_json}
-
-Please create a clear, structured summary of:
-1. What was accomplished
-2. Key findings or data obtained
-3. Any issues encountered
-4. Next steps if needed
-
-Be concise but comprehensive.
 """
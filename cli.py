@@ -1,31 +1,40 @@
 """CLI interface for AI Operations Assistant"""
-import json
+import asyncio
+import io
 import logging
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+
+import orjson
 
 from config import Config
 from orchestrator import AIOperationsOrchestrator
 
 # Setup logging
-logging.basicConfig(
-    level=Config.LOG_LEVEL,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+logging.basicConfig(level=Config.LOG_LEVEL, format=Config.LOG_FORMAT, force=True)
 logger = logging.getLogger(__name__)
 
 
 class AIACLI:
     """Command-line interface for AI Operations Assistant"""
     
-    def __init__(self):
-        """Initialize CLI"""
+    def __init__(self, verbose: bool = False, function_calling: bool = False):
+        """
+        Initialize CLI
+        
+        Args:
+            verbose: Also print the full JSON result after the report
+            function_calling: Answer with one function-calling conversation
+                instead of the planner, executor and verifier agents
+        """
+        self.verbose = verbose or Config.DEBUG
+        self.function_calling = function_calling or Config.FUNCTION_CALLING
         try:
             Config.validate()
             self.orchestrator = AIOperationsOrchestrator()
             logger.info("AI Operations Assistant CLI initialized")
         except ValueError as e:
-            logger.error(f"Failed to initialize: {str(e)}")
+            logger.error("Failed to initialize: %s", e)
             print(f"Error: {str(e)}")
             sys.exit(1)
     
@@ -36,70 +45,191 @@ class AIACLI:
         Args:
             task: Natural language task
         """
-        logger.info(f"Processing task: {task}")
-        print(f"\n{'='*70}")
-        print(f"Task: {task}")
-        print(f"{'='*70}\n")
+        logger.info("Processing task: %s", task)
+        sys.stdout.write(self._format_header(task))
+        sys.stdout.flush()
+        
+        streamed_chunks = []
+        sections_written = []
+        
+        def print_sections(plan: Dict[str, Any], execution_result: Dict[str, Any]):
+            # Plan and step results are known before verification starts, so show them first
+            sys.stdout.write(self._format_steps({"plan": plan, "execution": execution_result}))
+            print("📊 FINAL ANSWER")
+            print("-" * 70)
+            sys.stdout.flush()
+            sections_written.append(True)
+        
+        def print_summary_chunk(chunk: str):
+            # Show the LLM summary as it is generated instead of after the last token
+            if not streamed_chunks:
+                print("Summary:")
+            streamed_chunks.append(chunk)
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
         
         try:
-            result = self.orchestrator.process_task(task)
+            if self.function_calling:
+                sys.stdout.write(self._format_result(self.orchestrator.process_task_fn(task)))
+                return
             
-            # Display plan
-            if "plan" in result:
-                print("📋 PLAN")
-                print("-" * 70)
-                plan = result["plan"]
-                print(f"Objective: {plan.get('objective')}")
-                print(f"\nSteps:")
-                for step in plan.get("steps", []):
-                    print(f"  {step.get('step_number')}. {step.get('description')}")
-                    if step.get('tool') != 'none':
-                        print(f"     Tool: {step.get('tool')}")
-                print()
+            result = self.orchestrator.process_task(
+                task,
+                on_summary_chunk=print_summary_chunk,
+                on_executed=print_sections
+            )
+            if not sections_written:
+                sys.stdout.write(self._format_result(result))
+                return
             
-            # Display execution results
-            if "execution" in result:
-                print("⚙️  EXECUTION RESULTS")
-                print("-" * 70)
-                for step_result in result["execution"].get("results", []):
-                    step_num = step_result.get("step_number")
-                    status = step_result.get("status")
-                    desc = step_result.get("description")
-                    
-                    status_icon = "✓" if status == "completed" else "✗" if status == "failed" else "○"
-                    print(f"{status_icon} Step {step_num}: {desc} [{status}]")
-                    
-                    if status == "completed" and "result" in step_result:
-                        result_data = step_result["result"]
-                        if result_data.get("status") == "success":
-                            print(f"   Result: Success")
-                            if "count" in result_data:
-                                print(f"   Items found: {result_data['count']}")
-                        else:
-                            print(f"   Error: {result_data.get('error')}")
-                print()
+            if streamed_chunks:
+                print("\n")
+            sys.stdout.write(
+                self._format_final_answer(result, streamed_summary="".join(streamed_chunks), header=False)
+                + self._format_details(result)
+            )
+        except Exception as e:
+            logger.error("Error processing task: %s", e)
+            print(f"Error: {str(e)}")
+            sys.exit(1)
+    
+    def run_batch(self, tasks: List[str]):
+        """
+        Run several tasks concurrently through the orchestrator
+        
+        Args:
+            tasks: Natural language tasks
+        """
+        logger.info("Processing batch of %s tasks", len(tasks))
+        results = asyncio.run(self._process_batch(tasks))
+        
+        for task, result in zip(tasks, results):
+            if isinstance(result, Exception):
+                logger.error("Error processing task: %s", result)
+                report = f"Error: {str(result)}\n"
+            else:
+                report = self._format_result(result)
+            sys.stdout.write(self._format_header(task) + report)
+    
+    async def _process_batch(self, tasks: List[str]) -> List[Any]:
+        """Process tasks on one event loop so their LLM calls overlap"""
+        if self.function_calling:
+            loop = asyncio.get_running_loop()
+            calls = [loop.run_in_executor(None, self.orchestrator.process_task_fn, task) for task in tasks]
+        else:
+            calls = [self.orchestrator.process_task_async(task) for task in tasks]
+        return await asyncio.gather(*calls, return_exceptions=True)
+    
+    def _format_header(self, task: str) -> str:
+        """Format the task banner"""
+        out = io.StringIO()
+        print(f"\n{'='*70}", file=out)
+        print(f"Task: {task}", file=out)
+        print(f"{'='*70}\n", file=out)
+        return out.getvalue()
+    
+    def _format_result(self, result: Dict[str, Any]) -> str:
+        """
+        Format an orchestrator result as a report
+        
+        The report is built in memory so it reaches stdout in a single write.
+        
+        Args:
+            result: Result from the orchestrator
             
-            # Display final answer
-            if "verification" in result:
-                print("📊 FINAL ANSWER")
-                print("-" * 70)
-                final_answer = result["verification"].get("final_answer", {})
-                completion = final_answer.get("completion", {})
+        Returns:
+            Report text
+        """
+        return self._format_steps(result) + self._format_final_answer(result) + self._format_details(result)
+    
+    def _format_steps(self, result: Dict[str, Any]) -> str:
+        """Format the plan and execution sections of a result"""
+        out = io.StringIO()
+        
+        # Display plan
+        if "plan" in result:
+            print("📋 PLAN", file=out)
+            print("-" * 70, file=out)
+            plan = result["plan"]
+            print(f"Objective: {plan.get('objective')}", file=out)
+            print(f"\nSteps:", file=out)
+            for step in plan.get("steps", []):
+                print(f"  {step.get('step_number')}. {step.get('description')}", file=out)
+                if step.get('tool') != 'none':
+                    print(f"     Tool: {step.get('tool')}", file=out)
+            print(file=out)
+        
+        # Display execution results
+        if "execution" in result:
+            print("⚙️  EXECUTION RESULTS", file=out)
+            print("-" * 70, file=out)
+            for step_result in result["execution"].get("results", []):
+                step_num = step_result.get("step_number")
+                status = step_result.get("status")
+                desc = step_result.get("description")
                 
-                print(f"Completion Status: {completion.get('successful_steps')}/{completion.get('expected_steps')} steps")
-                print(f"\nSummary:")
-                print(final_answer.get("summary", "N/A"))
-                print()
+                status_icon = "✓" if status == "completed" else "✗" if status == "failed" else "○"
+                print(f"{status_icon} Step {step_num}: {desc} [{status}]", file=out)
+                
+                if status == "completed" and "result" in step_result:
+                    result_data = step_result["result"]
+                    if result_data.get("status") == "success":
+                        print(f"   Result: Success", file=out)
+                        if "count" in result_data:
+                            print(f"   Items found: {result_data['count']}", file=out)
+                    else:
+                        print(f"   Error: {result_data.get('error')}", file=out)
+            print(file=out)
+        
+        return out.getvalue()
+    
+    def _format_final_answer(
+        self,
+        result: Dict[str, Any],
+        streamed_summary: Optional[str] = None,
+        header: bool = True
+    ) -> str:
+        """
+        Format the final answer section of a result
+        
+        Args:
+            result: Result from the orchestrator
+            streamed_summary: Summary already printed while streaming, if any
+            header: Include the section header (omitted when it was printed before streaming)
             
-            # Display raw results if available
-            print("📋 DETAILED RESULTS")
-            print("-" * 70)
-            print(json.dumps(result, indent=2, default=str))
+        Returns:
+            Section text
+        """
+        out = io.StringIO()
+        
+        # Display final answer
+        if "final_answer" in result:
+            if header:
+                print("📊 FINAL ANSWER", file=out)
+                print("-" * 70, file=out)
+            final_answer = result["final_answer"]
+            completion = final_answer.get("completion", {})
             
-        except Exception as e:
-            logger.error(f"Error processing task: {str(e)}")
-            print(f"Error: {str(e)}")
-            sys.exit(1)
+            print(f"Completion Status: {completion.get('successful_steps')}/{completion.get('expected_steps')} steps", file=out)
+            summary = final_answer.get("summary", "N/A")
+            if summary != streamed_summary:
+                print(f"\nSummary:", file=out)
+                print(summary, file=out)
+            print(file=out)
+        
+        return out.getvalue()
+    
+    def _format_details(self, result: Dict[str, Any]) -> str:
+        """Format the full JSON result, shown only in verbose mode"""
+        out = io.StringIO()
+        
+        # The sections above already cover the result; dump it in full only on request
+        if self.verbose:
+            print("📋 DETAILED RESULTS", file=out)
+            print("-" * 70, file=out)
+            print(orjson.dumps(result, option=orjson.OPT_INDENT_2, default=str).decode(), file=out)
+        
+        return out.getvalue()
     
     def interactive_mode(self):
         """Run in interactive mode"""
@@ -126,18 +256,31 @@ class AIACLI:
                 print("\n\nGoodbye!")
                 break
             except Exception as e:
-                logger.error(f"Error: {str(e)}")
+                logger.error("Error: %s", e)
                 print(f"Error: {str(e)}")
 
 
 def main():
     """Main entry point"""
-    cli = AIACLI()
+    args = sys.argv[1:]
+    verbose = "--verbose" in args
+    if verbose:
+        args.remove("--verbose")
+    function_calling = "--function-calling" in args
+    if function_calling:
+        args.remove("--function-calling")
+    
+    cli = AIACLI(verbose=verbose, function_calling=function_calling)
     
+    # Batch mode: one task per line in a file
+    if len(args) == 2 and args[0] == "--batch":
+        with open(args[1], encoding="utf-8") as f:
+            tasks = [line.strip() for line in f if line.strip()]
+        cli.run_batch(tasks)
     # Check if task provided as argument
-    if len(sys.argv) > 1:
+    elif args:
         # Join all arguments as task
-        task = " ".join(sys.argv[1:])
+        task = " ".join(args)
         cli.run(task)
     else:
         # Run in interactive mode
@@ -2,9 +2,13 @@
 Configuration module for AI Operations Assistant
 """
 import os
+from functools import lru_cache
+
 from dotenv import load_dotenv
 
-load_dotenv()
+# Scripts that export the environment themselves can skip parsing .env
+if os.environ.get("AIA_SKIP_DOTENV") != "1":
+    load_dotenv()
 
 
 class Config:
@@ -14,6 +18,8 @@ class Config:
     LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+    LLM_MAX_CONNECTIONS = 20
+    LLM_MAX_KEEPALIVE_CONNECTIONS = 10
     
     # API Keys
     GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
@@ -22,21 +28,39 @@ class Config:
     # Server Configuration
     SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
     SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+    SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "1"))
     DEBUG = os.getenv("DEBUG", "false").lower() == "true"
     
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    # Epoch seconds instead of asctime, which runs strftime for every record
+    LOG_FORMAT = "%(created).3f - %(name)s - %(levelname)s - %(message)s"
     
     # Agent Configuration
     MAX_RETRIES = 3
     TIMEOUT = 30
+    HTTP_POOL_SIZE = 16
+    MAX_PARALLEL_STEPS = 8
+    # Answer with one function-calling conversation instead of planner -> executor -> verifier
+    FUNCTION_CALLING = os.getenv("FUNCTION_CALLING", "false").lower() == "true"
+    MAX_TOOL_ROUNDS = 4  # function-calling rounds before the model must answer
+    SPECULATIVE_EXECUTION = os.getenv("SPECULATIVE_EXECUTION", "true").lower() == "true"
+    
+    # Caching (a TTL or size of 0 turns that cache off)
+    PLAN_CACHE_SIZE = int(os.getenv("PLAN_CACHE_SIZE", "1024"))
+    PLAN_CACHE_TTL = int(os.getenv("PLAN_CACHE_TTL", "600"))  # seconds
+    GITHUB_CACHE_TTL = int(os.getenv("GITHUB_CACHE_TTL", "3600"))  # star-sorted search results change slowly
+    WEATHER_CACHE_TTL = int(os.getenv("WEATHER_CACHE_TTL", "600"))
+    PLAN_TEMPLATE_CACHE_SIZE = int(os.getenv("PLAN_TEMPLATE_CACHE_SIZE", "256"))
+    PLAN_TEMPLATE_DB = os.getenv("PLAN_TEMPLATE_DB", ":memory:")  # file path to persist templates
     
-    @staticmethod
-    def validate():
-        """Validate required configuration"""
-        if not Config.OPENAI_API_KEY:
+    @classmethod
+    @lru_cache(maxsize=1)
+    def validate(cls):
+        """Validate required configuration (cached after the first success)"""
+        if not cls.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY must be set in .env file")
-        if not Config.GITHUB_TOKEN:
+        if not cls.GITHUB_TOKEN:
             raise ValueError("GITHUB_TOKEN must be set in .env file")
-        if not Config.WEATHER_API_KEY:
+        if not cls.WEATHER_API_KEY:
             raise ValueError("WEATHER_API_KEY must be set in .env file")
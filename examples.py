@@ -10,7 +10,7 @@ orchestrator = AIOperationsOrchestrator()
 task = "Find the top 5 Python repositories on GitHub with the most stars"
 result = orchestrator.process_task(task)
 
-print(f"Task: {result['user_task']}")
+print(f"Task: {result['task']}")
 print(f"Status: {result['status']}")
 print(f"Summary: {result['final_answer']['summary']}")
 
@@ -1,4 +1,4 @@
 """LLM module for AI Operations Assistant"""
-from .openai_client import OpenAIClient
+from .openai_client import OpenAIClient, close_shared_clients
 
-__all__ = ["OpenAIClient"]
+__all__ = ["OpenAIClient", "close_shared_clients"]
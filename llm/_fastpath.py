@@ -0,0 +1,53 @@
+"""
+Hot string routines for the LLM client
+
+Kept free of dynamic features and fully annotated so the module can be
+compiled with mypyc (``mypyc llm/_fastpath.py``). A compiled extension
+next to this file takes precedence on import; without one the pure-Python
+definitions are used.
+"""
+import re
+from typing import Optional, Tuple
+
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+
+
+def find_json_span(text: str) -> Optional[Tuple[int, int]]:
+    """
+    Locate the first complete JSON object embedded in text
+    
+    Jumps between braces, quotes and backslashes only, tracking nesting
+    depth and skipping braces inside string literals.
+    
+    Args:
+        text: Text that may contain a JSON object
+        
+    Returns:
+        (start, end) slice bounds of the outermost object, or None
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped_at = -1
+    for match in _JSON_TOKEN_RE.finditer(text, start):
+        char = match.group()
+        position = match.start()
+        if char == "\\":
+            if in_string and escaped_at != position:
+                escaped_at = position + 1
+        elif escaped_at == position:
+            continue
+        elif char == '"':
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif char == "{":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return start, position + 1
+    return None
@@ -1,11 +1,13 @@
 """Base class for LLM clients"""
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 
 class BaseLLMClient(ABC):
     """Abstract base class for LLM clients"""
     
+    __slots__ = ()
+    
     @abstractmethod
     def create_message(
         self,
@@ -25,3 +27,45 @@ class BaseLLMClient(ABC):
     ) -> Dict[str, Any]:
         """Create a structured JSON message using the LLM"""
         pass
+    
+    @abstractmethod
+    def create_message_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Create a message using the LLM, yielding text chunks as they arrive"""
+        pass
+    
+    @abstractmethod
+    async def create_message_async(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """Create a message using the LLM without blocking the event loop"""
+        pass
+    
+    @abstractmethod
+    async def create_message_json_async(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Create a structured JSON message without blocking the event loop"""
+        pass
+    
+    @abstractmethod
+    def create_message_with_tools(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        tool_choice: str = "auto",
+    ) -> Dict[str, Any]:
+        """Create a message that may request tool calls instead of answering"""
+        pass
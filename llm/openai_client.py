@@ -1,24 +1,122 @@
 """OpenAI client implementation"""
-import json
+import importlib.util
 import logging
-from typing import Any, Dict, List, Optional
+import re
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from openai import OpenAI
+import orjson
 
 from config import Config
+from ._fastpath import find_json_span
 from .base import BaseLLMClient
 
 logger = logging.getLogger(__name__)
 
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+_JSON_INSTRUCTION = {"role": "user", "content": "Respond with valid JSON only."}
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
+_JSON_SCAN_INTERVAL = 256  # streamed characters between checks for a complete object
+
+
+class _StreamedJson:
+    """Accumulates a streamed JSON response and spots when the object is complete"""
+    
+    __slots__ = ("parts", "pending")
+    
+    def __init__(self):
+        self.parts = []
+        self.pending = 0
+    
+    def feed(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Add a streamed chunk
+        
+        Args:
+            text: Next chunk of response text
+            
+        Returns:
+            The parsed object once it is complete, otherwise None
+        """
+        self.parts.append(text)
+        self.pending += len(text)
+        if self.pending < _JSON_SCAN_INTERVAL and "}" not in text:
+            return None
+        
+        self.pending = 0
+        response_text = "".join(self.parts)
+        span = find_json_span(response_text)
+        if span is None:
+            return None
+        try:
+            return orjson.loads(response_text[span[0]:span[1]])
+        except orjson.JSONDecodeError:
+            return None
+    
+    def text(self) -> str:
+        """Full response text received so far"""
+        return "".join(self.parts)
+
+
+_clients: Dict[str, Tuple[Any, Any]] = {}
+_clients_lock = threading.Lock()
+
+
+def _shared_clients(api_key: str) -> Tuple[Any, Any]:
+    """
+    Build the sync and async OpenAI SDK clients once per API key
+    
+    Every OpenAIClient (planner, verifier, orchestrator) shares these, so
+    concurrent calls reuse one connection pool, multiplexed over HTTP/2
+    when the h2 package is installed.
+    
+    Args:
+        api_key: OpenAI API key
+        
+    Returns:
+        (OpenAI, AsyncOpenAI) clients
+    """
+    with _clients_lock:
+        if api_key in _clients:
+            return _clients[api_key]
+        
+        # Imported here so entry points that never call the LLM skip loading the SDK
+        import httpx
+        from openai import AsyncOpenAI, OpenAI
+        
+        http2 = importlib.util.find_spec("h2") is not None
+        limits = httpx.Limits(
+            max_connections=Config.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=Config.LLM_MAX_KEEPALIVE_CONNECTIONS
+        )
+        _clients[api_key] = (
+            OpenAI(api_key=api_key, http_client=httpx.Client(http2=http2, limits=limits)),
+            AsyncOpenAI(api_key=api_key, http_client=httpx.AsyncClient(http2=http2, limits=limits))
+        )
+        return _clients[api_key]
+
+
+async def close_shared_clients() -> None:
+    """Close the pooled sync and async OpenAI connections (call on shutdown)"""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    
+    for client, async_client in clients:
+        client.close()
+        await async_client.close()
+
 
 class OpenAIClient(BaseLLMClient):
     """OpenAI LLM client"""
     
+    __slots__ = ("api_key", "model", "client", "async_client")
+    
     def __init__(self):
         """Initialize OpenAI client"""
         self.api_key = Config.OPENAI_API_KEY
         self.model = Config.OPENAI_MODEL
-        self.client = OpenAI(api_key=self.api_key)
+        self.client, self.async_client = _shared_clients(self.api_key)
     
     def create_message(
         self,
@@ -46,7 +144,7 @@ class OpenAIClient(BaseLLMClient):
             )
             return response.choices[0].message.content
         except Exception as e:
-            logger.error(f"Error creating message with OpenAI: {str(e)}")
+            logger.error("Error creating message with OpenAI: %s", e)
             raise
     
     def create_message_json(
@@ -58,6 +156,9 @@ class OpenAIClient(BaseLLMClient):
         """
         Create a structured JSON message using OpenAI API
         
+        The response is streamed and returned as soon as the top-level
+        object is complete.
+        
         Args:
             messages: List of message dicts with 'role' and 'content'
             temperature: Sampling temperature
@@ -67,23 +168,194 @@ class OpenAIClient(BaseLLMClient):
             Parsed JSON response from the LLM
         """
         try:
-            # Add instruction to return JSON
-            messages_with_json = messages.copy()
-            if messages_with_json[-1]["role"] == "user":
-                messages_with_json[-1]["content"] += "\n\nRespond with valid JSON only."
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._with_json_instruction(messages),
+                temperature=temperature,
+                max_tokens=max_tokens or 2000,
+                response_format=_JSON_RESPONSE_FORMAT,
+                stream=True,
+            )
+            streamed = _StreamedJson()
+            try:
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parsed = streamed.feed(chunk.choices[0].delta.content)
+                        if parsed is not None:
+                            return parsed
+            finally:
+                # Stops generation as soon as the object is complete
+                stream.response.close()
+            return self._parse_json_response(streamed.text())
+        except Exception as e:
+            logger.error("Error creating JSON message with OpenAI: %s", e)
+            raise
+    
+    def create_message_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Create a message using OpenAI API with streaming
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            
+        Yields:
+            Response text chunks as they are generated
+        """
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens or 2000,
+                stream=True,
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            logger.error("Error streaming message with OpenAI: %s", e)
+            raise
+    
+    def create_message_with_tools(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        tool_choice: str = "auto",
+    ) -> Dict[str, Any]:
+        """
+        Create a message using OpenAI function calling
+        
+        Args:
+            messages: Chat messages, including earlier tool calls and tool results
+            tools: Function schemas the model may call
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            tool_choice: "auto" to let the model call tools, "none" to force an answer
+            
+        Returns:
+            Assistant message dict, with "tool_calls" when the model requests tools
+        """
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                temperature=temperature,
+                max_tokens=max_tokens or 2000,
+            )
+            return response.choices[0].message.model_dump(exclude_none=True)
+        except Exception as e:
+            logger.error("Error creating tool-calling message with OpenAI: %s", e)
+            raise
+    
+    async def create_message_async(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """
+        Create a message using the async OpenAI API
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
             
-            response_text = self.create_message(messages_with_json, temperature, max_tokens)
+        Returns:
+            Response text from the LLM
+        """
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens or 2000,
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            logger.error("Error creating message with OpenAI: %s", e)
+            raise
+    
+    async def create_message_json_async(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Create a structured JSON message using the async OpenAI API
+        
+        The response is streamed and returned as soon as the top-level
+        object is complete.
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
             
-            # Extract JSON from response
+        Returns:
+            Parsed JSON response from the LLM
+        """
+        try:
+            stream = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=self._with_json_instruction(messages),
+                temperature=temperature,
+                max_tokens=max_tokens or 2000,
+                response_format=_JSON_RESPONSE_FORMAT,
+                stream=True,
+            )
+            streamed = _StreamedJson()
             try:
-                return json.loads(response_text)
-            except json.JSONDecodeError:
-                # Try to extract JSON if it's embedded in text
-                import re
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group())
-                raise ValueError(f"Could not parse JSON from response: {response_text}")
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parsed = streamed.feed(chunk.choices[0].delta.content)
+                        if parsed is not None:
+                            return parsed
+            finally:
+                # Stops generation as soon as the object is complete
+                await stream.response.aclose()
+            return self._parse_json_response(streamed.text())
         except Exception as e:
-            logger.error(f"Error creating JSON message with OpenAI: {str(e)}")
+            logger.error("Error creating JSON message with OpenAI: %s", e)
             raise
+    
+    def _with_json_instruction(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Add instruction to return JSON
+        
+        The instruction is appended as its own message so the caller's
+        messages are left untouched and the prompt prefix stays cacheable.
+        """
+        return messages + [_JSON_INSTRUCTION]
+    
+    def _parse_json_response(self, response_text: str) -> Dict[str, Any]:
+        """Extract JSON from response"""
+        try:
+            return orjson.loads(response_text)
+        except orjson.JSONDecodeError:
+            pass
+        
+        # Try to extract JSON if it's embedded in text
+        span = find_json_span(response_text)
+        if span:
+            try:
+                return orjson.loads(response_text[span[0]:span[1]])
+            except orjson.JSONDecodeError:
+                pass
+        
+        json_match = _JSON_RE.search(response_text)
+        if json_match:
+            return orjson.loads(json_match.group())
+        raise ValueError(f"Could not parse JSON from response: {response_text}")
@@ -1,22 +1,25 @@
 """Main FastAPI application"""
+import asyncio
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
 
 from config import Config
-from orchestrator import AIOperationsOrchestrator
 
 # Setup logging
-logging.basicConfig(level=Config.LOG_LEVEL)
+logging.basicConfig(level=Config.LOG_LEVEL, format=Config.LOG_FORMAT, force=True)
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI
 app = FastAPI(
     title="AI Operations Assistant",
     description="Multi-agent system for executing complex tasks",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Initialize orchestrator
@@ -27,28 +30,52 @@ orchestrator = None
 async def startup_event():
     """Initialize on startup"""
     global orchestrator
+    # Deferred so importing the app does not load the agents, tools and LLM SDK
+    from orchestrator import AIOperationsOrchestrator
+    
     try:
         Config.validate()
         orchestrator = AIOperationsOrchestrator()
         logger.info("AI Operations Assistant initialized successfully")
     except ValueError as e:
-        logger.error(f"Failed to initialize: {str(e)}")
+        logger.error("Failed to initialize: %s", e)
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled connections on shutdown"""
+    if orchestrator:
+        orchestrator.close()
+        
+        from llm import close_shared_clients
+        await close_shared_clients()
+
+
 # Request/Response models
 class TaskRequest(BaseModel):
     """Task request model"""
-    task: str
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True)
+    
+    task: str = Field(min_length=1, max_length=4096)
+
+
+# Validates raw request bytes in one pydantic-core call
+_TASK_REQUEST_ADAPTER = TypeAdapter(TaskRequest)
 
 
 class TaskResponse(BaseModel):
     """Task response model"""
+    model_config = ConfigDict(extra="ignore")
+    
     status: str
     task: str
-    plan: Dict[str, Any]
-    execution: Dict[str, Any]
-    final_answer: Dict[str, Any]
+    plan: Optional[Dict[str, Any]] = None
+    execution: Optional[Dict[str, Any]] = None
+    verification: Optional[Dict[str, Any]] = None
+    final_answer: Optional[Dict[str, Any]] = None
+    phase: Optional[str] = None
+    error: Optional[str] = None
 
 
 @app.get("/health")
@@ -60,27 +87,47 @@ async def health_check():
     }
 
 
-@app.post("/process-task", response_model=dict)
-async def process_task(request: TaskRequest):
+@app.post(
+    "/process-task",
+    response_model=TaskResponse,
+    response_model_exclude_unset=True,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": TaskRequest.model_json_schema()}}
+        }
+    }
+)
+async def process_task(raw_request: Request):
     """
     Process a user task
     
     Args:
-        request: Task request with natural language task
+        raw_request: HTTP request whose JSON body matches TaskRequest
         
     Returns:
         Processed result with plan, execution, and final answer
     """
+    try:
+        request = _TASK_REQUEST_ADAPTER.validate_json(await raw_request.body())
+    except ValidationError as e:
+        # Same error shape FastAPI produces for a declared body model
+        raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors()])
+    
     try:
         if not orchestrator:
             raise HTTPException(status_code=503, detail="Service not initialized")
         
-        logger.info(f"Received task: {request.task}")
-        result = orchestrator.process_task(request.task)
+        logger.info("Received task: %s", request.task)
+        if Config.FUNCTION_CALLING:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, orchestrator.process_task_fn, request.task)
+        else:
+            result = await orchestrator.process_task_async(request.task)
         
-        return result
+        return TaskResponse(**result)
     except Exception as e:
-        logger.error(f"Error processing task: {str(e)}")
+        logger.error("Error processing task: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -99,11 +146,21 @@ async def root():
 
 
 if __name__ == "__main__":
+    import importlib.util
+    import sys
+    
     import uvicorn
     
+    # uvloop and httptools ship with uvicorn[standard]; uvloop has no Windows build
+    has_uvloop = sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None
+    has_httptools = importlib.util.find_spec("httptools") is not None
+    
     uvicorn.run(
-        app,
+        "main:app",  # import string so extra workers can load the app
         host=Config.SERVER_HOST,
         port=Config.SERVER_PORT,
-        log_level=Config.LOG_LEVEL.lower()
+        log_level=Config.LOG_LEVEL.lower(),
+        workers=Config.SERVER_WORKERS,
+        loop="uvloop" if has_uvloop else "asyncio",
+        http="httptools" if has_httptools else "h11"
     )
@@ -1,12 +1,19 @@
 """Orchestrator - coordinates all agents"""
+import asyncio
 import json
 import logging
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
 
 from agents import PlannerAgent, ExecutorAgent, VerifierAgent
+from config import Config
+from plan_cache import PlanTemplateCache
 
 logger = logging.getLogger(__name__)
 
+FUNCTION_CALLING_SYSTEM_PROMPT = """You are an AI operations assistant. Use the available tools to gather the data the task needs, calling independent tools together in one turn. When you have what you need, answer with a clear, structured summary of the results."""
+
 
 class AIOperationsOrchestrator:
     """Orchestrates the multi-agent system"""
@@ -16,49 +23,298 @@ class AIOperationsOrchestrator:
         self.planner = PlannerAgent()
         self.executor = ExecutorAgent()
         self.verifier = VerifierAgent()
+        self.plan_templates = PlanTemplateCache(
+            Config.PLAN_TEMPLATE_DB, max_entries=Config.PLAN_TEMPLATE_CACHE_SIZE
+        )
     
-    def process_task(self, user_task: str) -> Dict[str, Any]:
+    def process_task(
+        self,
+        user_task: str,
+        on_summary_chunk: Optional[Callable[[str], None]] = None,
+        on_executed: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
         """
         Process a user task through all agents
         
         Args:
             user_task: Natural language task from user
+            on_summary_chunk: Optional callback receiving the final summary as it streams
+            on_executed: Optional callback receiving the plan and execution result
+                before verification starts
             
         Returns:
             Final result with validation
         """
-        logger.info(f"Processing task: {user_task}")
+        logger.info("Processing task: %s", user_task)
+        
+        # Step 1: Planner - create plan, unless a cached template fits
+        plan_result, speculation = self._start_planning(user_task)
+        if plan_result is None:
+            plan_result = self.planner.execute(user_task=user_task)
+        
+        return self._complete_task(user_task, plan_result, speculation, on_summary_chunk, on_executed)
+    
+    async def process_task_async(self, user_task: str) -> Dict[str, Any]:
+        """
+        Process a user task with non-blocking LLM planning
+        
+        Lets several tasks share one event loop (CLI batch mode, the API
+        server) so their planner LLM calls overlap. Execution and
+        verification run together in the default thread pool; independent
+        steps fan out on the executor's own pool.
+        
+        Args:
+            user_task: Natural language task from user
+            
+        Returns:
+            Final result with validation
+        """
+        logger.info("Processing task: %s", user_task)
+        
+        # Step 1: Planner - create plan, unless a cached template fits
+        plan_result, speculation = self._start_planning(user_task)
+        if plan_result is None:
+            plan_result = await self.planner.execute_async(user_task=user_task)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._complete_task, user_task, plan_result, speculation)
+    
+    def _start_planning(self, user_task: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[Any, Any]]]:
+        """
+        Do the work that precedes the planner call
+        
+        Args:
+            user_task: Natural language task from user
+            
+        Returns:
+            Planning result from a cached template (None when the planner must
+            run) and the speculative tool calls started for the planner's plan
+        """
+        plan_result = self._plan_from_template(user_task)
+        if plan_result is not None:
+            return plan_result, None
         
-        # Step 1: Planner - create plan
-        plan_result = self.planner.execute(user_task=user_task)
+        # Likely tool calls start now and overlap with LLM planning
+        return None, self._start_speculation(user_task)
+    
+    def _complete_task(
+        self,
+        user_task: str,
+        plan_result: Dict[str, Any],
+        speculation: Optional[Dict[Any, Any]],
+        on_summary_chunk: Optional[Callable[[str], None]] = None,
+        on_executed: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute and verify a plan once planning has finished
         
+        Args:
+            user_task: Natural language task from user
+            plan_result: Result from the planner or the template cache
+            speculation: Speculative tool calls from _start_planning
+            on_summary_chunk: Optional callback receiving the final summary as it streams
+            on_executed: Optional callback receiving the plan and execution result
+            
+        Returns:
+            Final result with validation
+        """
         if plan_result["status"] != "success":
-            logger.error(f"Planning failed: {plan_result.get('error')}")
+            logger.error("Planning failed: %s", plan_result.get('error'))
+            self._cancel_speculation(speculation)
             return {
                 "status": "error",
+                "task": user_task,
                 "phase": "planning",
                 "error": plan_result.get("error")
             }
         
         plan = plan_result["plan"]
-        logger.info(f"Plan created with {len(plan['steps'])} steps")
+        logger.info("Plan created with %s steps", len(plan['steps']))
         
         # Step 2: Executor - execute plan
-        execution_result = self.executor.execute(plan=plan)
+        execution_result = self.executor.execute(plan=plan, speculation=speculation)
         
-        logger.info(f"Executed {execution_result['steps_executed']} steps")
+        logger.info("Executed %s steps", execution_result['steps_executed'])
+        if on_executed is not None:
+            on_executed(plan, execution_result)
         
         # Step 3: Verifier - validate and format results
         verification_result = self.verifier.execute(
             plan=plan,
-            execution_result=execution_result
+            execution_result=execution_result,
+            on_summary_chunk=on_summary_chunk
         )
+        self._remember_plan(user_task, plan_result, verification_result)
         
         return {
             "status": "success",
-            "user_task": user_task,
+            "task": user_task,
             "plan": plan,
             "execution": execution_result,
             "verification": verification_result,
             "final_answer": verification_result["final_answer"]
         }
+    
+    def process_task_fn(self, user_task: str) -> Dict[str, Any]:
+        """
+        Process a user task with a single function-calling conversation
+        
+        The model requests tool calls directly, the calls of each turn run in
+        parallel on the executor, and the model writes the final answer
+        itself, replacing the separate planner and verifier LLM calls. Falls
+        back to process_task when the LLM is unavailable or the conversation
+        fails.
+        
+        Args:
+            user_task: Natural language task from user
+            
+        Returns:
+            Final result with the tool calls made as plan steps
+        """
+        logger.info("Processing task with function calling: %s", user_task)
+        
+        if not self.planner.llm_available:
+            return self.process_task(user_task)
+        
+        try:
+            return self._run_tool_conversation(user_task)
+        except Exception as e:
+            logger.warning("Function calling failed: %s, using agent pipeline", e)
+            return self.process_task(user_task)
+    
+    def _run_tool_conversation(self, user_task: str) -> Dict[str, Any]:
+        """Alternate model turns and parallel tool execution until the model answers"""
+        messages: List[Dict[str, Any]] = [
+            {"role": "system", "content": FUNCTION_CALLING_SYSTEM_PROMPT},
+            {"role": "user", "content": user_task}
+        ]
+        tools = self.executor.tool_schemas()
+        steps = []
+        results = []
+        
+        for round_number in range(Config.MAX_TOOL_ROUNDS + 1):
+            # The last round withholds tools so the model has to answer
+            tool_choice = "none" if round_number == Config.MAX_TOOL_ROUNDS else "auto"
+            message = self.planner.llm.create_message_with_tools(
+                messages, tools, temperature=0.3, tool_choice=tool_choice
+            )
+            tool_calls = message.get("tool_calls")
+            if not tool_calls:
+                break
+            
+            round_steps = [
+                {
+                    "step_number": len(steps) + index + 1,
+                    "description": f"Call {call['function']['name']}",
+                    "tool": call["function"]["name"],
+                    "params": json.loads(call["function"].get("arguments") or "{}")
+                }
+                for index, call in enumerate(tool_calls)
+            ]
+            execution = self.executor.execute({"objective": user_task, "steps": round_steps})
+            
+            messages.append(message)
+            for call, step_result in zip(tool_calls, execution["results"]):
+                output = step_result.get("result", {"error": step_result.get("error")})
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": call["id"],
+                    "content": orjson.dumps(output, default=str).decode()
+                })
+            
+            steps.extend(round_steps)
+            results.extend(execution["results"])
+        
+        logger.info("Answered after %s tool calls", len(results))
+        
+        plan = {
+            "task": user_task,
+            "objective": user_task,
+            "steps": steps,
+            "success_criteria": "Model answered using tool results"
+        }
+        execution_result = {
+            "status": "success",
+            "steps_executed": len(results),
+            "results": results
+        }
+        successful_steps = sum(1 for result in results if result.get("status") == "completed")
+        completion = {
+            "expected_steps": len(results),
+            "executed_steps": len(results),
+            "successful_steps": successful_steps,
+            "all_steps_completed": successful_steps == len(results)
+        }
+        return {
+            "status": "success",
+            "task": user_task,
+            "plan": plan,
+            "execution": execution_result,
+            "final_answer": {
+                "task": user_task,
+                "completion": completion,
+                "summary": message.get("content", ""),
+                "raw_results": results
+            }
+        }
+    
+    def close(self) -> None:
+        """Release HTTP connections, worker threads and the template store"""
+        self.executor.close()
+        self.plan_templates.close()
+    
+    def _plan_from_template(self, user_task: str) -> Optional[Dict[str, Any]]:
+        """
+        Build a plan from a cached template instead of calling the planner
+        
+        Args:
+            user_task: Natural language task from user
+            
+        Returns:
+            Planning result, or None when no template matches
+        """
+        plan = self.plan_templates.lookup(user_task)
+        if plan is None:
+            return None
+        
+        logger.info("Using cached plan template")
+        return {"status": "success", "plan": plan, "source": "template"}
+    
+    def _remember_plan(
+        self,
+        user_task: str,
+        plan_result: Dict[str, Any],
+        verification_result: Dict[str, Any]
+    ) -> None:
+        """Keep fully successful LLM plans as templates for similar tasks"""
+        if plan_result.get("source") != "llm" or verification_result["status"] != "success":
+            return
+        
+        try:
+            self.plan_templates.store(user_task, plan_result["plan"])
+        except Exception as e:
+            logger.warning("Could not store plan template: %s", e)
+    
+    def _start_speculation(self, user_task: str) -> Optional[Dict[Any, Any]]:
+        """
+        Start likely tool calls before the LLM plan is ready
+        
+        Args:
+            user_task: Natural language task from user
+            
+        Returns:
+            In-flight tool calls for the executor, or None when disabled
+        """
+        if not Config.SPECULATIVE_EXECUTION:
+            return None
+        
+        steps = self.planner.speculative_steps(user_task)
+        if not steps:
+            return None
+        
+        return self.executor.speculate(steps)
+    
+    def _cancel_speculation(self, speculation: Optional[Dict[Any, Any]]) -> None:
+        """Cancel speculative tool calls that will never be used"""
+        for future in (speculation or {}).values():
+            future.cancel()
@@ -0,0 +1,241 @@
+"""Plan template cache - reuses successful plans for tasks of the same shape"""
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from agents.planner import CITY_PATTERN
+
+logger = logging.getLogger(__name__)
+
+NUMBER_PATTERN = re.compile(r"(?<!\w)\d+(?!\w)")
+SLOT_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+
+
+def _marker(name: str) -> str:
+    """Placeholder written into templates for a slot"""
+    return "{{" + name + "}}"
+
+
+class PlanTemplateCache:
+    """
+    Cache of parameterized plans keyed by a fingerprint of the task's shape
+
+    City names and numbers in a task are lifted into slots, so
+    "top 5 repos and weather in London" and "top 3 repos and weather in Paris"
+    share one template. Entries live in SQLite (in memory unless a file path is
+    configured) and the least frequently used ones are evicted first.
+    """
+
+    def __init__(self, path: str = ":memory:", max_entries: int = 256):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite database path, ":memory:" for a per-process cache
+            max_entries: Number of templates to keep, 0 to store none
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS plan_cache ("
+            "fingerprint TEXT PRIMARY KEY, template TEXT NOT NULL, freq INTEGER NOT NULL DEFAULT 1)"
+        )
+        self._db.commit()
+
+    def lookup(self, user_task: str) -> Optional[Dict[str, Any]]:
+        """
+        Build a plan for the task from a cached template
+
+        Args:
+            user_task: Natural language task from user
+
+        Returns:
+            Plan with this task's slot values filled in, or None on a miss
+        """
+        fingerprint, slots = self._fingerprint(user_task)
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT template FROM plan_cache WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE plan_cache SET freq = freq + 1 WHERE fingerprint = ?", (fingerprint,)
+            )
+            self._db.commit()
+
+        return {"task": user_task, **self._fill(json.loads(row[0]), slots)}
+
+    def store(self, user_task: str, plan: Dict[str, Any]) -> bool:
+        """
+        Save a successful plan as a template for tasks of the same shape
+
+        Only plans whose tool params carry every slot are stored, so a
+        template never replays a param the new task asked to change. Tasks
+        without slots are left to the planner's own TTL cache, and plans that
+        cannot be rebuilt exactly from their template (for example when two
+        slots share a value) are not stored either.
+
+        Args:
+            user_task: Task the plan was created for
+            plan: Plan that completed successfully
+
+        Returns:
+            True if the template was stored
+        """
+        if self.max_entries < 1:
+            return False
+        
+        fingerprint, slots = self._fingerprint(user_task)
+        if not slots or len(set(slots.values())) != len(slots):
+            return False
+
+        # The task text is restored verbatim on lookup, so only the rest is templated
+        plan = {key: value for key, value in plan.items() if key != "task"}
+        template = self._templatize(plan, slots)
+        if not self._slots_in_params(template, slots) or self._fill(template, slots) != plan:
+            return False
+
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO plan_cache (fingerprint, template) VALUES (?, ?) "
+                "ON CONFLICT(fingerprint) DO UPDATE SET template = excluded.template",
+                (fingerprint, json.dumps(template))
+            )
+            self._db.execute(
+                "DELETE FROM plan_cache WHERE fingerprint IN ("
+                "SELECT fingerprint FROM plan_cache ORDER BY freq DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._db.commit()
+
+        logger.info("Stored plan template %s", fingerprint[:12])
+        return True
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._db.close()
+
+    def _fingerprint(self, user_task: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Normalize a task and lift its city names and numbers into slots
+
+        Args:
+            user_task: Natural language task from user
+
+        Returns:
+            SHA-256 of the normalized task, and slot values by slot name
+        """
+        slots = {}
+
+        def lift(prefix: str):
+            def replace(match: "re.Match") -> str:
+                name = f"{prefix}{sum(1 for key in slots if key.startswith(prefix))}"
+                slots[name] = match.group(0)
+                return _marker(name)
+            return replace
+
+        normalized = " ".join(user_task.lower().split())
+        normalized = CITY_PATTERN.sub(lift("city"), normalized)
+        normalized = NUMBER_PATTERN.sub(lift("num"), normalized)
+
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest(), slots
+
+    def _slots_in_params(self, template: Dict[str, Any], slots: Dict[str, str]) -> bool:
+        """
+        Check that every slot drives a tool param in the template
+
+        A city must be a whole param value; "{{city0}} City" would turn
+        "New York City" into "Paris City". A number may sit inside a param
+        string, as in "stars:>{{num0}}".
+
+        Args:
+            template: Templated plan
+            slots: Slot values by slot name
+
+        Returns:
+            True if the template can safely be reused for other slot values
+        """
+        values = []
+        for step in template.get("steps", []):
+            self._collect_leaves(step.get("params", {}), values)
+        strings = [value for value in values if isinstance(value, str)]
+
+        for name in slots:
+            marker = _marker(name)
+            if name.startswith("city"):
+                if marker not in strings or any(marker in value and value != marker for value in strings):
+                    return False
+            elif not any(marker in value for value in strings):
+                return False
+        return True
+
+    def _collect_leaves(self, value: Any, leaves: List[Any]) -> None:
+        """Append the scalar values nested in value to leaves"""
+        if isinstance(value, dict):
+            for item in value.values():
+                self._collect_leaves(item, leaves)
+        elif isinstance(value, list):
+            for item in value:
+                self._collect_leaves(item, leaves)
+        else:
+            leaves.append(value)
+
+    def _templatize(self, value: Any, slots: Dict[str, str], in_params: bool = False) -> Any:
+        """
+        Replace slot values in a plan with {{slot}} markers
+
+        Integers are only templated inside step params, so step numbers and
+        dependencies never pick up a task's numbers.
+        """
+        if isinstance(value, dict):
+            return {
+                key: self._templatize(item, slots, in_params or key == "params")
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self._templatize(item, slots, in_params) for item in value]
+        if in_params and isinstance(value, int) and not isinstance(value, bool):
+            for name, slot_value in slots.items():
+                if name.startswith("num") and str(value) == slot_value:
+                    return _marker(name)
+            return value
+        if isinstance(value, str):
+            for name, slot_value in slots.items():
+                value = re.sub(
+                    rf"(?<!\w){re.escape(slot_value)}(?!\w)",
+                    _marker(name),
+                    value,
+                    flags=re.IGNORECASE
+                )
+            return value
+        return value
+
+    def _fill(self, value: Any, slots: Dict[str, str]) -> Any:
+        """Substitute slot values back into a template"""
+        if isinstance(value, dict):
+            return {key: self._fill(item, slots) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._fill(item, slots) for item in value]
+        if isinstance(value, str):
+            whole = SLOT_PATTERN.fullmatch(value)
+            if whole and whole.group(1).startswith("num") and whole.group(1) in slots:
+                return int(slots[whole.group(1)])
+            return SLOT_PATTERN.sub(lambda match: self._slot_text(match, slots), value)
+        return value
+
+    def _slot_text(self, match: "re.Match", slots: Dict[str, str]) -> str:
+        """Render a slot value, title-casing city names as plans spell them"""
+        name = match.group(1)
+        if name not in slots:
+            return match.group(0)
+        if name.startswith("city"):
+            return slots[name].title()
+        return slots[name]
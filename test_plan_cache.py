@@ -0,0 +1,62 @@
+"""Tests for the plan template cache"""
+from plan_cache import PlanTemplateCache
+
+
+def make_plan(task, steps):
+    """Build a minimal plan around the given steps"""
+    return {
+        "task": task,
+        "objective": task,
+        "steps": [
+            {"step_number": index + 1, "description": "Step", "tool": tool, "params": params, "depends_on": []}
+            for index, (tool, params) in enumerate(steps)
+        ],
+        "success_criteria": "Done"
+    }
+
+
+def test_reuses_template_for_other_slot_values():
+    cache = PlanTemplateCache()
+    task = "Top 5 python repos and weather in London"
+    plan = make_plan(task, [
+        ("github_search_repos", {"query": "language:python", "max_results": 5}),
+        ("get_weather", {"city": "London", "units": "metric"}),
+    ])
+
+    assert cache.store(task, plan)
+
+    hit = cache.lookup("top 3 python repos and weather in Paris")
+    assert hit["steps"][0]["params"]["max_results"] == 3
+    assert hit["steps"][1]["params"]["city"] == "Paris"
+
+
+def test_refuses_city_missing_from_params():
+    cache = PlanTemplateCache()
+    task = "What's the weather in San Francisco?"
+
+    assert not cache.store(task, make_plan(task, [("get_weather", {"city": "SF"})]))
+    assert cache.lookup("What's the weather in Tokyo?") is None
+
+
+def test_refuses_number_missing_from_params():
+    cache = PlanTemplateCache()
+    task = "Show 3 python repos"
+
+    assert not cache.store(task, make_plan(task, [("github_search_repos", {"query": "python", "max_results": 10})]))
+    assert cache.lookup("Show 50 python repos") is None
+
+
+def test_refuses_partial_city_match():
+    cache = PlanTemplateCache()
+    task = "Weather in New York City"
+
+    assert not cache.store(task, make_plan(task, [("get_weather", {"city": "New York City"})]))
+    assert cache.lookup("Weather in Paris City") is None
+
+
+def test_skips_tasks_without_slots():
+    cache = PlanTemplateCache()
+    task = "Explain what a REST API is"
+
+    assert not cache.store(task, make_plan(task, [("none", {})]))
+    assert cache.lookup(task) is None
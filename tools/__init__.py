@@ -1,6 +1,26 @@
 """Tools module for AI Operations Assistant"""
-from .github_tool import GitHubTool
-from .weather_tool import WeatherTool
-from .base import BaseTool
+import importlib
 
-__all__ = ["GitHubTool", "WeatherTool", "BaseTool"]
+# Submodules are imported on first attribute access (PEP 562), so importing
+# one tool does not load the others
+_EXPORTS = {
+    "GitHubTool": ".github_tool",
+    "WeatherTool": ".weather_tool",
+    "BaseTool": ".base",
+    "create_session": ".base",
+    "ttl_cached": ".base",
+}
+
+__all__ = ["GitHubTool", "WeatherTool", "BaseTool", "create_session", "ttl_cached"]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,11 +1,91 @@
 """Base class for tools"""
+import functools
+import inspect
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import Config
+
+
+def create_session() -> requests.Session:
+    """
+    Create an HTTP session with connection pooling and retries
+    
+    Sharing one session across tools keeps TCP/TLS connections alive
+    between calls instead of reconnecting for every request.
+    
+    Returns:
+        Configured session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=Config.HTTP_POOL_SIZE,
+        pool_maxsize=Config.HTTP_POOL_SIZE,
+        max_retries=Retry(total=Config.MAX_RETRIES, backoff_factor=0.3)
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def ttl_cached(ttl: int, maxsize: int = 1024) -> Callable:
+    """
+    Cache successful results of a tool method for a limited time
+    
+    Calls are keyed by their bound arguments, so positional and keyword
+    spellings of the same call share an entry. Only results with status
+    "success" are cached, and cached dicts are returned as-is, so callers
+    must treat them as read-only.
+    
+    Args:
+        ttl: Seconds to keep a result
+        maxsize: Maximum number of cached results
+        
+    Returns:
+        Method decorator
+    """
+    def decorator(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        lock = threading.Lock()
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(bound.arguments.items())[1:]
+            try:
+                with lock:
+                    result = cache.get(key)
+            except TypeError:
+                # Unhashable arguments are passed through uncached
+                return method(self, *args, **kwargs)
+            if result is not None:
+                return result
+            
+            result = method(self, *args, **kwargs)
+            if result.get("status") == "success":
+                with lock:
+                    cache[key] = result
+            return result
+        
+        wrapper.cache = cache
+        return wrapper
+    return decorator
 
 
 class BaseTool(ABC):
     """Abstract base class for tools"""
     
+    # Empty so concrete tools that declare __slots__ carry no instance __dict__
+    __slots__ = ()
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -28,3 +108,7 @@ class BaseTool(ABC):
     def execute(self, **kwargs) -> Dict[str, Any]:
         """Execute the tool with given parameters"""
         pass
+    
+    def close(self) -> None:
+        """Release resources held by the tool"""
+        pass
@@ -1,20 +1,71 @@
 """GitHub API tool"""
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import requests
 
 from config import Config
-from .base import BaseTool
+from .base import BaseTool, create_session, ttl_cached
 
 logger = logging.getLogger(__name__)
 
+# Requests only the fields the tool returns, instead of the full REST payload
+GRAPHQL_SEARCH_QUERY = """
+query ($q: String!, $n: Int!) {
+  search(query: $q, type: REPOSITORY, first: $n) {
+    nodes {
+      ... on Repository {
+        name
+        url
+        description
+        stargazerCount
+        primaryLanguage { name }
+        owner { login }
+        forkCount
+        updatedAt
+      }
+    }
+  }
+}
+"""
+
+# Tool parameters schema
+GITHUB_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "query": {
+            "type": "string",
+            "description": "Search query (e.g., 'language:python stars:>1000')"
+        },
+        "max_results": {
+            "type": "integer",
+            "description": "Maximum number of results (default: 10)",
+            "default": 10
+        }
+    },
+    "required": ["query"]
+}
+
 
 class GitHubTool(BaseTool):
     """Tool for interacting with GitHub API"""
     
-    def __init__(self):
-        """Initialize GitHub tool"""
+    __slots__ = ("_owns_session", "session", "token", "base_url", "headers")
+    
+    # Plain class attributes: built once at import and identical on every access
+    name = "github_search_repos"
+    description = "Search GitHub repositories by query and get detailed information"
+    parameters: Dict[str, Any] = GITHUB_PARAMETERS
+    
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Initialize GitHub tool
+        
+        Args:
+            session: HTTP session to share with other tools (a new one is created if omitted)
+        """
+        self._owns_session = session is None
+        self.session = session or create_session()
         self.token = Config.GITHUB_TOKEN
         self.base_url = "https://api.github.com"
         self.headers = {
@@ -22,39 +73,19 @@ class GitHubTool(BaseTool):
             "Accept": "application/vnd.github.v3+json"
         }
     
-    @property
-    def name(self) -> str:
-        """Tool name"""
-        return "github_search_repos"
-    
-    @property
-    def description(self) -> str:
-        """Tool description"""
-        return "Search GitHub repositories by query and get detailed information"
-    
-    @property
-    def parameters(self) -> Dict[str, Any]:
-        """Tool parameters schema"""
-        return {
-            "type": "object",
-            "properties": {
-                "query": {
-                    "type": "string",
-                    "description": "Search query (e.g., 'language:python stars:>1000')"
-                },
-                "max_results": {
-                    "type": "integer",
-                    "description": "Maximum number of results (default: 10)",
-                    "default": 10
-                }
-            },
-            "required": ["query"]
-        }
+    def close(self) -> None:
+        """Close the HTTP session if this tool created it"""
+        if self._owns_session:
+            self.session.close()
     
+    @ttl_cached(ttl=Config.GITHUB_CACHE_TTL)
     def execute(self, query: str, max_results: int = 10) -> Dict[str, Any]:
         """
         Search GitHub repositories
         
+        Uses the GraphQL API when a token is configured (it requires
+        authentication) and falls back to the REST search endpoint.
+        
         Args:
             query: Search query
             max_results: Maximum number of results
@@ -62,6 +93,70 @@ class GitHubTool(BaseTool):
         Returns:
             Search results with repository information
         """
+        if self.token:
+            try:
+                return self._search_graphql(query, max_results)
+            except (requests.exceptions.RequestException, KeyError, TypeError, ValueError) as e:
+                logger.warning("GitHub GraphQL search failed, falling back to REST: %s", e)
+        return self._search_rest(query, max_results)
+    
+    def _search_graphql(self, query: str, max_results: int) -> Dict[str, Any]:
+        """Search repositories with a single GraphQL request"""
+        # Repository search sorts by best match unless asked otherwise
+        search_query = query if "sort:" in query else f"{query} sort:stars-desc"
+        data = self._graphql(
+            GRAPHQL_SEARCH_QUERY,
+            {"q": search_query, "n": max(1, min(max_results, 100))}
+        )
+        
+        results = []
+        for repo in data["search"]["nodes"][:max_results]:
+            if not repo:
+                continue
+            results.append({
+                "name": repo["name"],
+                "url": repo["url"],
+                "description": repo["description"],
+                "stars": repo["stargazerCount"],
+                "language": (repo["primaryLanguage"] or {}).get("name"),
+                "owner": repo["owner"]["login"],
+                "forks": repo["forkCount"],
+                "updated_at": repo["updatedAt"]
+            })
+        
+        return {
+            "status": "success",
+            "query": query,
+            "count": len(results),
+            "results": results
+        }
+    
+    def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a GitHub GraphQL query
+        
+        Args:
+            query: GraphQL document
+            variables: Query variables
+            
+        Returns:
+            The response's data object
+        """
+        response = self.session.post(
+            f"{self.base_url}/graphql",
+            json={"query": query, "variables": variables},
+            headers={**self.headers, "Accept": "application/vnd.github.v4+json"},
+            timeout=Config.TIMEOUT
+        )
+        response.raise_for_status()
+        
+        payload = response.json()
+        if payload.get("errors"):
+            raise ValueError(payload["errors"][0].get("message", "GraphQL error"))
+        return payload["data"]
+    
+    def _search_rest(self, query: str, max_results: int) -> Dict[str, Any]:
+        """Search repositories with the REST search endpoint"""
         try:
             url = f"{self.base_url}/search/repositories"
             params = {
@@ -71,7 +166,7 @@ class GitHubTool(BaseTool):
                 "per_page": min(max_results, 100)
             }
             
-            response = requests.get(
+            response = self.session.get(
                 url,
                 params=params,
                 headers=self.headers,
@@ -101,7 +196,7 @@ class GitHubTool(BaseTool):
                 "results": results
             }
         except requests.exceptions.RequestException as e:
-            logger.error(f"GitHub API error: {str(e)}")
+            logger.error("GitHub API error: %s", e)
             return {
                 "status": "error",
                 "error": str(e),
@@ -120,7 +215,7 @@ class GitHubTool(BaseTool):
         """
         try:
             url = f"{self.base_url}/users/{username}"
-            response = requests.get(
+            response = self.session.get(
                 url,
                 headers=self.headers,
                 timeout=Config.TIMEOUT
@@ -141,7 +236,7 @@ class GitHubTool(BaseTool):
                 }
             }
         except requests.exceptions.RequestException as e:
-            logger.error(f"GitHub API error: {str(e)}")
+            logger.error("GitHub API error: %s", e)
             return {
                 "status": "error",
                 "error": str(e),
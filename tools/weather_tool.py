@@ -1,52 +1,61 @@
 """Weather API tool"""
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import requests
 
 from config import Config
-from .base import BaseTool
+from .base import BaseTool, create_session, ttl_cached
 
 logger = logging.getLogger(__name__)
 
 
+# Tool parameters schema
+WEATHER_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "city": {
+            "type": "string",
+            "description": "City name (e.g., 'London', 'New York')"
+        },
+        "units": {
+            "type": "string",
+            "description": "Temperature units (metric, imperial)",
+            "default": "metric"
+        }
+    },
+    "required": ["city"]
+}
+
+
 class WeatherTool(BaseTool):
     """Tool for getting weather information"""
     
-    def __init__(self):
-        """Initialize Weather tool"""
-        self.api_key = Config.WEATHER_API_KEY
-        self.base_url = "https://api.openweathermap.org/data/2.5"
+    __slots__ = ("_owns_session", "session", "api_key", "base_url")
     
-    @property
-    def name(self) -> str:
-        """Tool name"""
-        return "get_weather"
+    # Plain class attributes: built once at import and identical on every access
+    name = "get_weather"
+    description = "Get current weather information for a city"
+    parameters: Dict[str, Any] = WEATHER_PARAMETERS
     
-    @property
-    def description(self) -> str:
-        """Tool description"""
-        return "Get current weather information for a city"
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Initialize Weather tool
+        
+        Args:
+            session: HTTP session to share with other tools (a new one is created if omitted)
+        """
+        self._owns_session = session is None
+        self.session = session or create_session()
+        self.api_key = Config.WEATHER_API_KEY
+        self.base_url = "https://api.openweathermap.org/data/2.5"
     
-    @property
-    def parameters(self) -> Dict[str, Any]:
-        """Tool parameters schema"""
-        return {
-            "type": "object",
-            "properties": {
-                "city": {
-                    "type": "string",
-                    "description": "City name (e.g., 'London', 'New York')"
-                },
-                "units": {
-                    "type": "string",
-                    "description": "Temperature units (metric, imperial)",
-                    "default": "metric"
-                }
-            },
-            "required": ["city"]
-        }
+    def close(self) -> None:
+        """Close the HTTP session if this tool created it"""
+        if self._owns_session:
+            self.session.close()
     
+    @ttl_cached(ttl=Config.WEATHER_CACHE_TTL)
     def execute(self, city: str, units: str = "metric") -> Dict[str, Any]:
         """
         Get current weather for a city
@@ -66,7 +75,7 @@ class WeatherTool(BaseTool):
                 "units": units
             }
             
-            response = requests.get(
+            response = self.session.get(
                 url,
                 params=params,
                 timeout=Config.TIMEOUT
@@ -91,7 +100,7 @@ class WeatherTool(BaseTool):
                 "units": units
             }
         except requests.exceptions.RequestException as e:
-            logger.error(f"Weather API error: {str(e)}")
+            logger.error("Weather API error: %s", e)
             return {
                 "status": "error",
                 "error": str(e),
@@ -117,7 +126,7 @@ class WeatherTool(BaseTool):
                 "units": units
             }
             
-            response = requests.get(
+            response = self.session.get(
                 url,
                 params=params,
                 timeout=Config.TIMEOUT
@@ -144,7 +153,7 @@ class WeatherTool(BaseTool):
                 "units": units
             }
         except requests.exceptions.RequestException as e:
-            logger.error(f"Weather API error: {str(e)}")
+            logger.error("Weather API error: %s", e)
             return {
                 "status": "error",
                 "error": str(e),